@@ -0,0 +1,44 @@
+"""Cold (JSON parse + cache write) vs warm (memory-mapped columnar cache) load of the issue feed
+
+Run from the repository root:
+    python benchmarks/bench_cache.py             # 1M issues
+    python benchmarks/bench_cache.py 200000
+The feed is written to a temporary db.json first; the cache lands next to it.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from civic_heatmap.cache import load_issues_cached
+from civic_heatmap.synthetic import write_issues
+
+
+def timed(path):
+    t0 = time.perf_counter()
+    df, kind = load_issues_cached(path)
+    # Touch every column so lazily mapped pages are actually read
+    checksum = float(df["latitude"].sum()) + int(df["category"].cat.codes.sum())
+    return time.perf_counter() - t0, kind, df, checksum
+
+
+def main(n):
+    with tempfile.TemporaryDirectory(prefix="civic_cache_") as directory:
+        path = os.path.join(directory, "db.json")
+        write_issues(path, n, seed=42, fmt="json")
+        print(f"{n:,} issues, feed {os.path.getsize(path) / 1e6:.1f} MB")
+
+        cold, kind_cold, cold_df, cold_sum = timed(path)
+        warm, kind_warm, warm_df, warm_sum = timed(path)
+        assert (kind_cold, kind_warm) == ("cold", "warm")
+        assert cold_sum == warm_sum and cold_df.dtypes.equals(warm_df.dtypes)
+
+        print(f"{'load':>6} {'seconds':>9}")
+        print(f"{'cold':>6} {cold:>9.3f}")
+        print(f"{'warm':>6} {warm:>9.3f}   {cold / warm:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
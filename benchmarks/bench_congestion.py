@@ -0,0 +1,100 @@
+"""Microbenchmark: per-location congestion loop (old generate_dynamic_traffic_data) vs CongestionModel
+
+Run from the repository root:
+    python benchmarks/bench_congestion.py            # 10, 1K and 5K monitored locations
+    python benchmarks/bench_congestion.py 20000
+Locations are the real profiles copied around Delhi with jittered coordinates.
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from civic_heatmap.congestion import CongestionModel
+from civic_heatmap.profiles import LOCATION_PROFILES, LOCATION_COORDS
+from civic_heatmap.traffic import get_congestion_status
+
+
+def make_locations(n, seed=0):
+    """n junction profiles cycling through LOCATION_PROFILES, scattered ~2 km around each"""
+    rng = np.random.default_rng(seed)
+    names = list(LOCATION_PROFILES)
+    profiles, coords = {}, {}
+    for i in range(n):
+        base = names[i % len(names)]
+        name = f"{base} #{i}"
+        profiles[name] = LOCATION_PROFILES[base]
+        coords[name] = {"lat": LOCATION_COORDS[base]["lat"] + rng.normal(0, 0.02),
+                        "lng": LOCATION_COORDS[base]["lng"] + rng.normal(0, 0.02)}
+    return profiles, coords
+
+
+def loop_traffic_data(profiles, coords, hour):
+    """What generate_dynamic_traffic_data used to do: one random.randint chain per location"""
+    traffic_data = []
+    for location_name, profile in profiles.items():
+        location_coords = coords[location_name]
+        congestion = 20
+        for peak_start, peak_end in profile["peak_hours"]:
+            if peak_start <= hour <= peak_end:
+                if profile["type"] == "commercial_hub":
+                    congestion += random.randint(40, 65)
+                elif profile["type"] == "medical_complex":
+                    congestion += random.randint(45, 70)
+                elif profile["type"] == "market_area":
+                    congestion += random.randint(35, 60)
+                else:
+                    congestion += random.randint(25, 50)
+                break
+        else:
+            congestion += random.randint(5, 30)
+        congestion = max(5, min(95, congestion + random.randint(-5, 5)))
+        traffic_data.append({
+            "name": location_name,
+            "lat": location_coords["lat"],
+            "lng": location_coords["lng"],
+            "congestion": congestion,
+            "status": get_congestion_status(congestion),
+            "profile": profile,
+            "last_updated": datetime.now().strftime("%H:%M:%S"),
+        })
+    return traffic_data
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main(sizes):
+    print(f"{'locations':>10} {'loop (s)':>10} {'model (s)':>10} {'speedup':>9} "
+          f"{'24h loop (s)':>13} {'forecast (s)':>13} {'speedup':>9}")
+    for n in sizes:
+        profiles, coords = make_locations(n)
+        model = CongestionModel(profiles, coords, seed=42)
+
+        old = best_of(lambda: loop_traffic_data(profiles, coords, 9))
+        new = best_of(lambda: model.traffic_data(9))
+        old_day = best_of(lambda: [loop_traffic_data(profiles, coords, h) for h in range(24)], repeat=1)
+        new_day = best_of(model.forecast)
+
+        # Sanity check: both draw from the same distribution (mean of 50 draws per location at 09:00)
+        matrix = model.forecast(np.full(50, 9))
+        looped = np.array([[t["congestion"] for t in loop_traffic_data(profiles, coords, 9)] for _ in range(50)])
+        assert abs(matrix.mean() - looped.mean()) < 1.5
+
+        print(f"{n:>10,} {old:>10.4f} {new:>10.4f} {old / new:>8.1f}x "
+              f"{old_day:>13.4f} {new_day:>13.4f} {old_day / new_day:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10, 1_000, 5_000])
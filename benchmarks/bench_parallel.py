@@ -0,0 +1,39 @@
+"""Scaling benchmark for parallel issue preparation with marker JS (1, 4 and 16 workers)
+
+Run from the repository root:
+    python benchmarks/bench_parallel.py             # 200k issues
+    python benchmarks/bench_parallel.py 1000000
+Output is checked to be byte-identical across worker counts.
+"""
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from civic_heatmap.parallel import prepare_records_parallel
+from civic_heatmap.synthetic import generate_issues
+
+WORKER_COUNTS = [1, 4, 16]
+
+
+def main(n):
+    df = generate_issues(n, seed=42)
+    print(f"{n:,} issues, {os.cpu_count()} CPU(s) available")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}  digest")
+    baseline = None
+    digests = set()
+    for workers in WORKER_COUNTS:
+        t0 = time.perf_counter()
+        lines = prepare_records_parallel(df, marker_js=True, workers=workers)["marker_js"].tolist()
+        elapsed = time.perf_counter() - t0
+        digest = hashlib.sha1("\n".join(lines).encode()).hexdigest()[:12]
+        digests.add(digest)
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x  {digest}")
+    assert len(digests) == 1, "output differs between worker counts"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
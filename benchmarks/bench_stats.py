@@ -0,0 +1,57 @@
+"""Microbenchmark: boolean-mask statistics (old Phase 4/9) vs the single-pass IssueStats cube
+
+Run from the repository root:
+    python benchmarks/bench_stats.py            # 1M and 10M rows
+    python benchmarks/bench_stats.py 100000     # custom sizes
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from civic_heatmap.stats import IssueStats
+from civic_heatmap.synthetic import generate_issues
+
+
+def mask_stats(df):
+    """What Phase 4 + Phase 9 used to do: one filtered copy per category and severity"""
+    per_category = {cat: len(df[df['category'] == cat]) for cat in df['category'].unique()}
+    return {
+        'total': len(df),
+        'high': len(df[df['severity'] == 'high']),
+        'medium': len(df[df['severity'] == 'medium']),
+        'low': len(df[df['severity'] == 'low']),
+        'categories': df['category'].value_counts().to_dict(),
+        'layers': per_category,
+    }
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main(sizes):
+    print(f"{'rows':>12} {'masks (s)':>12} {'IssueStats (s)':>15} {'speedup':>9}")
+    for n in sizes:
+        df = generate_issues(n, seed=42)
+        old = best_of(lambda: mask_stats(df))
+        new = best_of(lambda: IssueStats.from_frame(df).to_dict())
+
+        # Sanity check: both paths agree
+        expected = mask_stats(df)
+        got = IssueStats.from_frame(df)
+        assert got.total == expected['total']
+        assert got.severity_count('high') == expected['high']
+        assert got.by_category() == {c: n for c, n in expected['categories'].items() if n}
+
+        print(f"{n:>12,} {old:>12.3f} {new:>15.3f} {old / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000_000, 10_000_000])
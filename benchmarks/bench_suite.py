@@ -0,0 +1,147 @@
+"""End-to-end benchmark on seeded synthetic Delhi issues: load, aggregation, render, save, HTML size
+
+Run from the repository root:
+    python benchmarks/bench_suite.py                          # 10K, 1M and 10M issues
+    python benchmarks/bench_suite.py --scales 10000 200000
+    python benchmarks/bench_suite.py --compare benchmarks/baseline.json
+    python benchmarks/bench_suite.py --scales 10000 1000000 --output benchmarks/baseline.json
+
+With --output, results are written as a JSON baseline so later runs on the same machine can
+be compared against it; the file compared against is never the one written. The map is the real pipeline (civic_heatmap.build.build_map/export,
+all layers). Above --markers-limit issues it uses the tiled issue layer and a pre-aggregated
+heatmap, since inlining every issue is not viable at that size.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from civic_heatmap import build
+from civic_heatmap.cache import load_issues_cached
+from civic_heatmap.loader import load_issues
+from civic_heatmap.profiling import BuildProfiler, peak_rss_mb
+from civic_heatmap.synthetic import write_issues
+
+DEFAULT_SCALES = [10_000, 1_000_000, 10_000_000]
+# build_map phases that prepare data rather than emit layers: issue columns, stats cube and
+# marker JS (prepare_issues), heat points or pyramid levels (heatmap)
+AGGREGATE_PHASES = ("prepare_issues", "heatmap")
+# Metrics compared against a baseline (lower is better for all of them)
+COMPARED = ["generate_s", "load_s", "load_cached_s", "aggregate_s", "render_s", "save_s", "html_bytes"]
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, round(time.perf_counter() - t0, 3)
+
+
+def directory_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+
+def run_scale(n, seed, markers_limit, workdir):
+    feed = os.path.join(workdir, f"issues_{n}.jsonl")
+    tile_dir = os.path.join(workdir, f"tiles_{n}")
+    heat_dir = os.path.join(workdir, f"heat_{n}")
+    out_html = os.path.join(workdir, f"map_{n}.html")
+    mode = "markers" if n <= markers_limit else "tiles"
+    result = {"issues": n, "mode": mode}
+
+    _, result["generate_s"] = timed(write_issues, feed, n, seed)
+    result["feed_bytes"] = os.path.getsize(feed)
+    df, result["load_s"] = timed(load_issues, feed)
+    # First cached call writes the columnar cache, the second one is the warm load
+    load_issues_cached(feed)
+    _, result["load_cached_s"] = timed(load_issues_cached, feed)
+
+    profiler = BuildProfiler()
+    (m, _), result["render_s"] = timed(
+        build.build_map, df, issue_layer_mode=mode, heatmap_preaggregate=(mode == "tiles"),
+        tile_dir=tile_dir, heat_dir=heat_dir, output=out_html, traffic_seed=seed, profiler=profiler,
+        verbose=False)
+    result["aggregate_s"] = round(sum(p["wall_s"] for p in profiler.phases if p["phase"] in AGGREGATE_PHASES), 3)
+    _, result["save_s"] = timed(build.export, m, out_html)
+    result["html_bytes"] = os.path.getsize(out_html)
+    result["tile_bytes"] = directory_bytes(tile_dir) if os.path.isdir(tile_dir) else 0
+    result["heat_bytes"] = directory_bytes(heat_dir) if os.path.isdir(heat_dir) else 0
+    result["peak_rss_mb"] = peak_rss_mb()
+
+    for path in (feed, out_html):
+        os.remove(path)
+    for path in (feed + ".cache", tile_dir, heat_dir):
+        shutil.rmtree(path, ignore_errors=True)
+    return result
+
+
+def load_baseline(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, baseline_path):
+    print(f"\nChange vs {baseline_path} (ratio < 1.00 is an improvement):")
+    for key, current in results.items():
+        before = baseline.get(key)
+        if before is None:
+            print(f"{int(key):>12,}  (not in baseline)")
+            continue
+        ratios = "  ".join(
+            f"{metric}={current[metric] / before[metric]:.2f}" for metric in COMPARED
+            if before.get(metric) and current.get(metric) is not None
+        )
+        print(f"{int(key):>12,}  {ratios}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the map build on synthetic issues")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--markers-limit", type=int, default=10_000,
+                        help="largest issue count rendered in markers mode")
+    parser.add_argument("--output", help="baseline JSON file to write (default: results are only printed)")
+    parser.add_argument("--compare", help="earlier baseline JSON file to compare against")
+    args = parser.parse_args(argv)
+    if args.output and args.compare and os.path.abspath(args.output) == os.path.abspath(args.compare):
+        parser.error("--output and --compare are the same file; write the new baseline elsewhere")
+    # Read before any benchmark runs, so the comparison always sees the earlier numbers
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    results = {}
+    print(f"{'issues':>12} {'mode':>8} {'gen':>7} {'load':>7} {'cached':>7} {'agg':>7} "
+          f"{'render':>7} {'save':>7} {'html MB':>8} {'rss MB':>8}")
+    with tempfile.TemporaryDirectory(prefix="civic_bench_") as workdir:
+        for n in args.scales:
+            r = run_scale(n, args.seed, args.markers_limit, workdir)
+            results[str(n)] = r
+            print(f"{n:>12,} {r['mode']:>8} {r['generate_s']:>7.2f} {r['load_s']:>7.2f} {r['load_cached_s']:>7.2f} "
+                  f"{r['aggregate_s']:>7.2f} {r['render_s']:>7.2f} {r['save_s']:>7.2f} "
+                  f"{r['html_bytes'] / 1e6:>8.2f} {r['peak_rss_mb'] or 0:>8.0f}")
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": args.seed,
+        "markers_limit": args.markers_limit,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if baseline is not None:
+        compare(results, baseline, args.compare)
+
+
+if __name__ == "__main__":
+    main()
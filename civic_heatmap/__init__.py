@@ -0,0 +1,31 @@
+"""Reusable building blocks for the Delhi civic issue heatmap
+
+Submodules are imported on first attribute access, so `import civic_heatmap` (and the
+CLI's traffic-only paths) do not pull in pandas or folium.
+"""
+import importlib
+
+# public name -> submodule that defines it
+_EXPORTS = {
+    "iter_records": "loader",
+    "iter_issue_chunks": "loader",
+    "load_issues": "loader",
+    "load_issues_cached": "cache",
+    "generate_dynamic_traffic_data": "traffic",
+    "CongestionModel": "congestion",
+    "load": "build",
+    "build_map": "build",
+    "export": "build",
+    "run": "build",
+    "build_shards": "shards",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
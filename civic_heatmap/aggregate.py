@@ -0,0 +1,166 @@
+import json
+import os
+
+import numpy as np
+from branca.element import Template, MacroElement
+
+from .payload import dump_payload
+
+# --------------------------
+# Server-side heatmap pre-aggregation (grid / hex pyramids)
+# --------------------------
+TILE_SIZE = 256
+# Leaflet.heat bins points into cells of (radius + blur) / 2 px before drawing, so
+# pre-binning at the same size gives the browser almost the same picture for far fewer points
+DEFAULT_CELL_PX = 12
+# Stop the pyramid at the first zoom where cells hold fewer points than this on average:
+# past that point cells no longer merge and a level would be as big as the raw points
+MIN_POINTS_PER_CELL = 2.0
+_SQRT3 = np.sqrt(3.0)
+
+
+def project_to_pixels(lat, lon, zoom):
+    """Web-Mercator pixel coordinates of lat/lon arrays at a given zoom level"""
+    lat = np.clip(np.asarray(lat, dtype=float), -85.05112878, 85.05112878)
+    lon = np.asarray(lon, dtype=float)
+    world = TILE_SIZE * (2 ** zoom)
+    x = (lon + 180.0) / 360.0 * world
+    sin_lat = np.sin(np.radians(lat))
+    y = (0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * np.pi)) * world
+    return x, y
+
+
+def _grid_cells(x, y, cell_px):
+    return np.floor(x / cell_px).astype(np.int64), np.floor(y / cell_px).astype(np.int64)
+
+
+def _hex_cells(x, y, cell_px):
+    """Axial coordinates of pointy-top hexagons with `cell_px` circumradius (cube rounding)"""
+    q = (_SQRT3 / 3.0 * x - y / 3.0) / cell_px
+    r = (2.0 / 3.0 * y) / cell_px
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return rq.astype(np.int64), rr.astype(np.int64)
+
+
+def aggregate_points(lat, lon, weights, zoom, cell_px=DEFAULT_CELL_PX, shape="grid"):
+    """Bin points into grid or hex cells at `zoom`; returns an (n_cells, 3) array of
+    [weighted-centroid lat, weighted-centroid lon, summed weight]"""
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    if lat.size == 0:
+        return np.empty((0, 3))
+
+    x, y = project_to_pixels(lat, lon, zoom)
+    if shape == "grid":
+        i, j = _grid_cells(x, y, cell_px)
+    elif shape == "hex":
+        i, j = _hex_cells(x, y, cell_px)
+    else:
+        raise ValueError(f"Unknown cell shape: {shape!r} (expected 'grid' or 'hex')")
+
+    # One int64 key per cell, then a single unique + bincount pass
+    i = i - i.min()
+    j = j - j.min()
+    keys = i * (int(j.max()) + 1) + j
+    _, inverse = np.unique(keys, return_inverse=True)
+    n_cells = int(inverse.max()) + 1
+
+    total = np.bincount(inverse, weights=weights, minlength=n_cells)
+    safe_total = np.where(total > 0, total, 1.0)
+    cell_lat = np.bincount(inverse, weights=lat * weights, minlength=n_cells) / safe_total
+    cell_lon = np.bincount(inverse, weights=lon * weights, minlength=n_cells) / safe_total
+    return np.column_stack((cell_lat, cell_lon, total))
+
+
+def build_heat_pyramid(lat, lon, weights, min_zoom=10, max_zoom=18, cell_px=DEFAULT_CELL_PX, shape="grid",
+                       precision=5, min_points_per_cell=MIN_POINTS_PER_CELL):
+    """Severity-weighted heat cells per zoom level from min_zoom up.
+
+    Levels stop before the first zoom (<= max_zoom) whose cells average fewer than
+    `min_points_per_cell` points; higher zooms reuse the last level. `min_zoom` is always built.
+    """
+    n_points = len(lat)
+    pyramid = {}
+    for zoom in range(min_zoom, max_zoom + 1):
+        cells = aggregate_points(lat, lon, weights, zoom, cell_px, shape)
+        if pyramid and len(cells) * min_points_per_cell > n_points:
+            break
+        cells[:, :2] = np.round(cells[:, :2], precision)
+        pyramid[zoom] = cells
+    return pyramid
+
+
+def export_heat_levels(pyramid, out_dir):
+    """Write each pyramid level to `<out_dir>/<zoom>.json` and drop levels no longer built"""
+    os.makedirs(out_dir, exist_ok=True)
+    names = {f"{zoom}.json" for zoom in pyramid}
+    for name in os.listdir(out_dir):
+        if name.endswith(".json") and name not in names:
+            os.remove(os.path.join(out_dir, name))
+    for zoom, cells in pyramid.items():
+        with open(os.path.join(out_dir, f"{zoom}.json"), "w", encoding="utf-8") as f:
+            json.dump(cells.tolist(), f, separators=(",", ":"))
+    return out_dir
+
+
+# --------------------------
+# Client-side level switching for an existing folium HeatMap
+# --------------------------
+class HeatPyramidLayer(MacroElement):
+    """Swap a HeatMap's points for the pre-aggregated level matching the map's zoom.
+
+    With `url_root`, levels are fetched from `<url_root>/<zoom>.json` (see export_heat_levels)
+    the first time that zoom is shown, so only the HeatMap's initial points are in the page;
+    serve the output folder rather than opening it via file://. Without it, every level is
+    inlined. Zooms past the last level keep showing the last level.
+    """
+
+    _template = Template("""
+{% macro script(this, kwargs) %}
+(function() {
+    var levels = {{ this.levels }};
+    var heat = {{ this.heatmap.get_name() }};
+    var map = {{ this._parent.get_name() }};
+    var root = {{ this.url_root|tojson }};
+    var minZoom = {{ this.min_zoom }}, maxZoom = {{ this.max_zoom }};
+    var current = null;
+
+    function showLevel() {
+        var z = Math.max(minZoom, Math.min(maxZoom, Math.round(map.getZoom())));
+        if (z === current) { return; }
+        current = z;
+        if (levels[z]) {
+            heat.setLatLngs(levels[z]);
+            return;
+        }
+        fetch(root + '/' + z + '.json')
+            .then(function(r) { return r.ok ? r.json() : null; })
+            .then(function(cells) {
+                if (!cells) { return; }
+                levels[z] = cells;
+                if (current === z) { heat.setLatLngs(cells); }
+            })
+            .catch(function() {});
+    }
+    map.on('zoomend', showLevel);
+    showLevel();
+})();
+{% endmacro %}
+""")
+
+    def __init__(self, heatmap, pyramid, url_root=None):
+        super().__init__()
+        self._name = "HeatPyramidLayer"
+        self.heatmap = heatmap
+        self.min_zoom = min(pyramid)
+        self.max_zoom = max(pyramid)
+        self.url_root = url_root.rstrip("/") if url_root else None
+        inlined = pyramid if url_root is None else {}
+        self.levels = dump_payload({str(z): cells.tolist() for z, cells in inlined.items()})
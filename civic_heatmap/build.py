@@ -0,0 +1,483 @@
+import os
+from datetime import datetime
+
+import folium
+from folium.plugins import HeatMap, MarkerCluster, MeasureControl
+
+from .cache import load_issues_cached
+from .incremental import IncrementalBuild
+from .popups import PopupStyles
+from .profiles import LOCATION_PROFILES, LOCATION_COORDS
+from .profiling import BuildProfiler
+from .render import add_issue_markers, heat_points
+from .temporal import TemporalIndex, apply_time_window
+from .congestion import CongestionModel
+from .traffic import traffic_popup_html, traffic_tooltip, location_issue_notes, congestion_level_counts
+
+# --------------------------
+# Map build pipeline: load -> layers -> export
+# --------------------------
+# Modules only needed by one issue-layer mode (tiles, payload, viewport, parallel) or by the
+# pre-aggregated heatmap are imported inside the step that uses them.
+ALL_LAYERS = ("issues", "traffic", "heatmap", "legend")
+ISSUE_LAYER_MODES = ("markers", "payload", "tiles", "viewport")
+DELHI_CENTER = [28.6139, 77.2090]
+DELHI_BOUNDS = [[28.4, 76.8], [28.9, 77.6]]
+MIN_ZOOM = 10
+MAX_ZOOM = 18
+HEAT_GRADIENT = {0.2: 'blue', 0.4: 'cyan', 0.6: 'lime', 0.8: 'yellow', 1.0: 'red'}
+DEFAULT_OUTPUT = "optimized_delhi_traffic_map.html"
+
+
+def page_url(path, output):
+    """`path` as a URL relative to the page saved at `output`"""
+    return os.path.relpath(path, os.path.dirname(os.path.abspath(output))).replace(os.sep, "/")
+
+
+# --------------------------
+# Phase 1: Load dataset
+# --------------------------
+def load(path="db.json", time_window=None, use_cache=True, chunksize=50_000, verbose=True):
+    """Load the issue feed (columnar cache when fresh) and apply an optional time window.
+
+    Returns (df, time_index); the TemporalIndex is built over the returned rows.
+    """
+    on_chunk = (lambda chunk: print(f"   ↳ chunk of {len(chunk)} records parsed")) if verbose else None
+    # Warm: memory-map the columnar cache. Cold: stream-parse JSON in fixed-size chunks
+    # (timestamp/category/severity coerced per chunk) and write the cache for next time.
+    df, load_kind = load_issues_cached(path, chunksize=chunksize, on_chunk=on_chunk, refresh=not use_cache)
+    if verbose:
+        print(f"✅ Data loaded: {len(df)} records ({'columnar cache' if load_kind == 'warm' else 'parsed JSON'})")
+
+    # Sorted timestamp index: windows are binary searches instead of full scans
+    time_index = TemporalIndex(df['timestamp'])
+    if time_window:
+        df = apply_time_window(df, time_index, time_window)
+        time_index = TemporalIndex(df['timestamp'])
+        if verbose:
+            print(f"🕒 Time window {time_window}: {len(df)} records")
+    return df, time_index
+
+
+# --------------------------
+# Phase 2: Optimized Base Map (Delhi focused, no mini map)
+# --------------------------
+def create_base_map(center=DELHI_CENTER, bounds=DELHI_BOUNDS):
+    """Base map (Delhi NCR by default) with light tile layers and a measure control"""
+    # Focused on one region with tighter bounds
+    m = folium.Map(
+        location=center,
+        zoom_start=11,
+        tiles=None,
+        max_bounds=True,
+        min_zoom=MIN_ZOOM,
+        max_zoom=MAX_ZOOM
+    )
+
+    # Add lighter tile layers for better performance
+    folium.TileLayer('CartoDB positron', name='🌞 Light Mode').add_to(m)
+    folium.TileLayer('OpenStreetMap', name='🗺️ Street Map').add_to(m)
+
+    # Add measure control but no mini map for performance
+    m.add_child(MeasureControl())
+
+    # Set bounds to the region only
+    m.fit_bounds(bounds)
+
+    # Popup styling shared by traffic and issue popups, injected once into the page header
+    m.add_child(PopupStyles())
+    return m
+
+
+# --------------------------
+# Phase 4: Optimized Category Layers
+# --------------------------
+def prepare_issues(df, build_cache=None, marker_js=False, render_workers=1, verbose=True):
+    """Prepared issue columns and the IssueStats cube, re-rendering only changed records.
+
+    With `marker_js` the columns include each record's marker JS line (markers mode), also
+    cached between builds. New and changed records are prepared across `render_workers`
+    processes.
+    Returns (build, issue_cols); `build.stats` holds the cube, `build.save()` once the map
+    is written.
+    """
+    build = IncrementalBuild(build_cache)
+    if render_workers > 1:
+        from .parallel import prepare_records_parallel
+        issue_cols = build.update(df, marker_js=marker_js,
+                                  prepare=lambda fresh, lines: prepare_records_parallel(fresh, lines, render_workers))
+    else:
+        issue_cols = build.update(df, marker_js=marker_js)
+    if verbose:
+        update = build.last_update
+        print(f"♻️ {update['reused']} records reused from cache, {update['new'] + update['changed']} re-rendered, "
+              f"{update['removed']} removed" + (f", {update['marker_js']} marker lines emitted" if marker_js else ""))
+    return build, issue_cols
+
+
+def add_category_layers(m, issue_stats, categories=()):
+    """One FeatureGroup per category, named with its issue count.
+
+    `categories` (the prepared issue_cols["category"]) adds a layer for any category the
+    cube has no count for, so every marker has a layer to go to.
+    """
+    category_counts = issue_stats.by_category()
+    category_layers = {}
+    for cat in list(category_counts) + sorted(set(categories) - set(category_counts)):
+        layer_name = f"📊 {cat.capitalize()} ({category_counts.get(cat, 0)})"
+        category_layers[cat] = folium.FeatureGroup(name=layer_name)
+        category_layers[cat].add_to(m)
+    return category_layers
+
+
+# --------------------------
+# Phase 5: Traffic Congestion Layer (Initially Hidden)
+# --------------------------
+def traffic_data_for(df=None, profiles=LOCATION_PROFILES, coords=LOCATION_COORDS, seed=None, density_weight=0.0,
+                     radius_km=1.0):
+    """Current congestion per location, optionally blended with traffic-issue density from `df`"""
+    model = CongestionModel(profiles, coords, seed=seed)
+    if density_weight and df is not None:
+        model.set_issue_density(df, weight=density_weight, radius_km=radius_km)
+    return model.traffic_data()
+
+
+def add_traffic_layer(m, traffic_data, df=None, time_index=None, nearby_radius_km=1.0, profile_match_km=3.0,
+                      live_traffic_url=None, live_traffic_interval=60, profiles=LOCATION_PROFILES,
+                      coords=LOCATION_COORDS):
+    """Traffic CircleMarkers (hidden by default); returns {location name: marker}"""
+    traffic_layer = folium.FeatureGroup(name="🚦 Live Traffic Analysis", show=False)
+    traffic_layer.add_to(m)
+
+    # Nearby-issue counts and peak-hour share per location, shown in each traffic popup
+    location_notes = {}
+    if df is not None and coords:
+        location_notes = location_issue_notes(df, coords, profiles, radius_km=nearby_radius_km,
+                                              match_km=profile_match_km, time_index=time_index)
+
+    traffic_markers = {}
+    for location in traffic_data:
+        status = location["status"]
+        traffic_popup = traffic_popup_html(location, location_notes.get(location['name'], ""))
+
+        # Smaller traffic markers for better performance
+        traffic_marker = folium.CircleMarker(
+            location=[location['lat'], location['lng']],
+            radius=12,
+            color='white',
+            weight=2,
+            fillColor=status['color'],
+            fillOpacity=0.8,
+            popup=folium.Popup(traffic_popup, max_width=400),
+            tooltip=traffic_tooltip(location)
+        )
+        traffic_marker.add_to(traffic_layer)
+        traffic_markers[location['name']] = traffic_marker
+
+    # Live pages refresh the markers and legend from the traffic service instead of a rebuild
+    if live_traffic_url:
+        from .live import LiveTrafficUpdater
+        m.add_child(LiveTrafficUpdater(live_traffic_url, traffic_markers, interval=live_traffic_interval))
+    return traffic_markers
+
+
+# --------------------------
+# Phase 6/7: Marker cluster and issue markers
+# --------------------------
+def add_marker_cluster(m):
+    """Shared MarkerCluster (smaller radius for performance)"""
+    return MarkerCluster(
+        name="🎯 All Issues (Clustered)",
+        disableClusteringAtZoom=16,
+        maxClusterRadius=50
+    ).add_to(m)
+
+
+def add_issue_layer(m, df, issue_cols, category_layers, marker_cluster, mode="markers", tile_dir="issue_tiles",
+                    viewport_min_zoom=12, bounds=DELHI_BOUNDS, tile_url=None, changes=None, verbose=True):
+    """Fill the category layers and cluster using one of ISSUE_LAYER_MODES.
+
+    `tile_url` is the tile folder as seen from the saved page (default: `tile_dir`); tiles
+    mode has no cluster, so `marker_cluster` may be None there. `changes` (from the
+    incremental build) lets tiles mode rebuild only the tiles whose issues changed.
+    """
+    if mode not in ISSUE_LAYER_MODES:
+        raise ValueError(f"Unknown issue layer mode {mode!r}; expected one of {ISSUE_LAYER_MODES}")
+    # Colors, icons, times, tooltips, weights, popup rows (and marker JS) were computed in prepare_issues
+    if mode == "payload":
+        from .payload import IssuePayloadLayer
+        m.add_child(IssuePayloadLayer(df, category_layers, marker_cluster))
+    elif mode == "tiles":
+        from .tiles import export_tiles, TiledIssueLayer
+        # Zoom range matches the map's min_zoom/max_zoom; unchanged tiles are not rewritten
+        tile_summary = export_tiles(df, tile_dir, bounds, min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM, changes=changes)
+        if verbose:
+            print(f"🧩 Tiles: {tile_summary['written']} written, {tile_summary['unchanged']} unchanged, "
+                  f"{tile_summary['removed']} removed")
+        overview_layer = folium.FeatureGroup(name="🧩 Issue Overview").add_to(m)
+        m.add_child(TiledIssueLayer(tile_url or tile_dir, category_layers, overview_layer,
+                                    min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM))
+    elif mode == "viewport":
+        from .viewport import ViewportIssueLayer
+        # Heatmap covers the overview below viewport_min_zoom; markers are built per visible grid cell
+        m.add_child(ViewportIssueLayer(issue_cols, category_layers, marker_cluster, min_zoom=viewport_min_zoom))
+    else:
+        add_issue_markers(issue_cols, category_layers, marker_cluster)
+
+
+# --------------------------
+# Phase 8: Optimized Heatmap (smaller radius for performance)
+# --------------------------
+def add_heatmap(m, issue_cols, preaggregate=False, cell_shape="grid", heat_dir=None, heat_url=None):
+    """Issue Density heatmap, optionally pre-aggregated into per-zoom grid/hex cells.
+
+    Pre-aggregated levels are written to `heat_dir` and fetched from `heat_url` (default:
+    `heat_dir`) as the zoom changes; without `heat_dir` they are inlined.
+    """
+    if preaggregate:
+        from .aggregate import build_heat_pyramid, export_heat_levels, HeatPyramidLayer
+        # Severity-weighted cells per zoom level, up to the zoom where cells stop merging;
+        # the page starts with the lowest level and loads the others on zoom
+        heat_pyramid = build_heat_pyramid(issue_cols['lat'], issue_cols['lon'], issue_cols['heat_weight'],
+                                          min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM, shape=cell_shape)
+        if heat_dir:
+            export_heat_levels(heat_pyramid, heat_dir)
+        heatmap = HeatMap(heat_pyramid[MIN_ZOOM].tolist(), name="🌡️ Issue Density", radius=15, blur=10,
+                          gradient=HEAT_GRADIENT).add_to(m)
+        m.add_child(HeatPyramidLayer(heatmap, heat_pyramid, url_root=(heat_url or heat_dir) if heat_dir else None))
+        return heatmap
+    return HeatMap(heat_points(issue_cols), name="🌡️ Issue Density", radius=15, blur=10,
+                   gradient=HEAT_GRADIENT).add_to(m)
+
+
+# --------------------------
+# Phase 9: Compact Legend & Stats
+# --------------------------
+def legend_html(issue_stats, traffic_data, title="Delhi"):
+    """Dashboard box; the traffic block is shown by the traffic button and updated by live pages"""
+    stats = {
+        'total': issue_stats.total,
+        'high': issue_stats.severity_count('high'),
+        'medium': issue_stats.severity_count('medium'),
+        'low': issue_stats.severity_count('low'),
+    }
+
+    # Calculate traffic stats (one pass over congestion values)
+    traffic_levels = congestion_level_counts(traffic_data)
+    heavy_traffic = traffic_levels['Heavy']
+    moderate_traffic = traffic_levels['Moderate']
+    light_traffic = traffic_levels['Light']
+
+    # Compact legend for better performance
+    return f"""
+<div style="position:fixed; bottom:20px; left:20px; width:260px; background:rgba(255,255,255,0.95);
+            padding:15px; border-radius:10px; z-index:9999; font-size:12px;
+            box-shadow: 0 6px 20px rgba(0,0,0,0.1);">
+    <h4 style="margin: 0 0 12px 0; color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 6px; text-align: center;">
+        📊 {title} Dashboard
+    </h4>
+
+    <div style="margin-bottom: 12px;">
+        <h5 style="margin: 0 0 6px 0; color: #34495e;">📋 Issues: {stats['total']}</h5>
+        <div style="background: #f8f9fa; padding: 8px; border-radius: 6px; font-size: 11px;">
+            🔴 High: {stats['high']} | 🟠 Medium: {stats['medium']} | 🔵 Low: {stats['low']}
+        </div>
+    </div>
+
+    <div id="traffic-stats" style="margin-bottom: 12px; display: none;">
+        <h5 style="margin: 0 0 6px 0; color: #34495e;">🚦 Live Traffic:</h5>
+        <div style="background: #f8f9fa; padding: 8px; border-radius: 6px; font-size: 11px;">
+            🔴 Heavy: <span id="traffic-heavy">{heavy_traffic}</span> | 🟠 Moderate: <span id="traffic-moderate">{moderate_traffic}</span> | 🟢 Light: <span id="traffic-light">{light_traffic}</span>
+            <div id="live-update-time" style="margin-top: 6px; font-size: 10px; color: #7f8c8d; text-align: center;">
+                Last updated: {datetime.now().strftime('%H:%M:%S')}
+            </div>
+        </div>
+    </div>
+
+    <div style="font-size: 9px; color: #7f8c8d; text-align: center;
+               border-top: 1px solid #ecf0f1; padding-top: 8px;">
+        💡 Optimized for {title} region only
+    </div>
+</div>
+"""
+
+
+# --------------------------
+# Simplified Traffic Control for better performance
+# --------------------------
+TRAFFIC_BUTTON_HTML = """
+<div style="position: fixed; top: 80px; right: 15px; z-index: 1000;">
+    <button onclick="toggleTrafficLayer()"
+            style="background: linear-gradient(135deg, #e74c3c, #c0392b);
+                   color: white; border: none; padding: 12px 20px;
+                   border-radius: 25px; font-weight: bold; font-size: 14px;
+                   box-shadow: 0 4px 15px rgba(231, 76, 60, 0.3);
+                   cursor: pointer; transition: all 0.2s ease;"
+            onmouseover="this.style.transform='translateY(-1px)'"
+            onmouseout="this.style.transform='translateY(0px)'"
+            id="trafficButton">
+        🚦 Traffic Analysis
+    </button>
+</div>
+
+<script>
+var trafficLayerVisible = false;
+
+function toggleTrafficLayer() {
+    var button = document.getElementById('trafficButton');
+    var trafficStats = document.getElementById('traffic-stats');
+
+    if (!trafficLayerVisible) {
+        button.innerHTML = '🚦 Hide Traffic';
+        button.style.background = 'linear-gradient(135deg, #27ae60, #16a085)';
+        trafficStats.style.display = 'block';
+        trafficLayerVisible = true;
+        showNotification('✅ Traffic analysis activated!', 'success');
+    } else {
+        button.innerHTML = '🚦 Traffic Analysis';
+        button.style.background = 'linear-gradient(135deg, #e74c3c, #c0392b)';
+        trafficStats.style.display = 'none';
+        trafficLayerVisible = false;
+        showNotification('ℹ️ Traffic layer hidden', 'info');
+    }
+}
+
+function showNotification(message, type) {
+    var notification = document.createElement('div');
+    notification.style.cssText = `
+        position: fixed; top: 120px; right: 15px; z-index: 1001;
+        background: ${type === 'success' ? '#2ecc71' : '#3498db'};
+        color: white; padding: 10px 15px; border-radius: 8px;
+        font-size: 12px; max-width: 250px;
+    `;
+    notification.innerHTML = message;
+    document.body.appendChild(notification);
+
+    setTimeout(() => document.body.removeChild(notification), 3000);
+}
+</script>
+"""
+
+
+def add_legend(m, issue_stats, traffic_data, title="Delhi"):
+    """Add the dashboard legend and the traffic toggle button to the page"""
+    m.get_root().html.add_child(folium.Element(legend_html(issue_stats, traffic_data, title)))
+    m.get_root().html.add_child(folium.Element(TRAFFIC_BUTTON_HTML))
+
+
+# --------------------------
+# Whole pipeline
+# --------------------------
+def build_map(df, traffic_data=None, time_index=None, layers=ALL_LAYERS, issue_layer_mode="markers",
+              tile_dir="issue_tiles", render_workers=1, viewport_min_zoom=12, build_cache=None,
+              nearby_radius_km=1.0, profile_match_km=3.0, live_traffic_url=None, live_traffic_interval=60,
+              heatmap_preaggregate=False, heatmap_cell_shape="grid", center=DELHI_CENTER, bounds=DELHI_BOUNDS,
+              profiles=LOCATION_PROFILES, coords=LOCATION_COORDS, title="Delhi",
+              traffic_seed=None, traffic_density_weight=0.0, heat_dir="heat_levels", output=DEFAULT_OUTPUT,
+              profiler=None, verbose=True):
+    """Assemble the map from `layers` (any of ALL_LAYERS).
+
+    `center`, `bounds`, `profiles`/`coords` and `title` describe the region (Delhi NCR by
+    default). Without `traffic_data`, congestion comes from a CongestionModel seeded with
+    `traffic_seed` and blended with `traffic_density_weight` of traffic-issue density.
+    Folders written next to the page (tiles, heat levels) are linked relative to `output`.
+    Returns (map, build); call `export(m, output, build)` to write it and the build cache.
+    """
+    unknown = set(layers) - set(ALL_LAYERS)
+    if unknown:
+        raise ValueError(f"Unknown layers {sorted(unknown)}; expected some of {ALL_LAYERS}")
+    profiler = profiler or BuildProfiler(enabled=False)
+    if traffic_data is None:
+        profiler.begin("traffic_model")
+        traffic_data = traffic_data_for(df, profiles, coords, seed=traffic_seed,
+                                        density_weight=traffic_density_weight, radius_km=nearby_radius_km)
+
+    profiler.begin("base_map")
+    m = create_base_map(center, bounds)
+
+    profiler.begin("prepare_issues")
+    # Markers mode splices cached per-record marker JS instead of folium objects
+    marker_js = "issues" in layers and issue_layer_mode == "markers"
+    build, issue_cols = prepare_issues(df, build_cache, marker_js=marker_js, render_workers=render_workers,
+                                       verbose=verbose)
+    issue_stats = build.stats  # category x severity x day cube shared by layer names, legend and stats
+
+    profiler.begin("category_layers")
+    category_layers = add_category_layers(m, issue_stats, issue_cols["category"]) if "issues" in layers else {}
+
+    if "traffic" in layers:
+        profiler.begin("traffic")
+        add_traffic_layer(m, traffic_data, df, time_index, nearby_radius_km=nearby_radius_km,
+                          profile_match_km=profile_match_km, live_traffic_url=live_traffic_url,
+                          live_traffic_interval=live_traffic_interval, profiles=profiles, coords=coords)
+
+    if "issues" in layers:
+        profiler.begin("marker_cluster")
+        # Tiles mode draws into the category layers and its own overview layer only
+        marker_cluster = add_marker_cluster(m) if issue_layer_mode != "tiles" else None
+        profiler.begin("issue_markers")
+        add_issue_layer(m, df, issue_cols, category_layers, marker_cluster, mode=issue_layer_mode,
+                        tile_dir=tile_dir, viewport_min_zoom=viewport_min_zoom,
+                        bounds=bounds, tile_url=page_url(tile_dir, output), changes=build.changes,
+                        verbose=verbose)
+
+    if "heatmap" in layers:
+        profiler.begin("heatmap")
+        add_heatmap(m, issue_cols, preaggregate=heatmap_preaggregate, cell_shape=heatmap_cell_shape,
+                    heat_dir=heat_dir, heat_url=page_url(heat_dir, output) if heat_dir else None)
+
+    if "legend" in layers:
+        profiler.begin("legend")
+        add_legend(m, issue_stats, traffic_data, title)
+
+    # --------------------------
+    # Phase 10: Layer Control
+    # --------------------------
+    profiler.begin("layer_control")
+    folium.LayerControl(collapsed=True, position='topright').add_to(m)
+    profiler.end()
+    return m, build
+
+
+def export(m, output=DEFAULT_OUTPUT, build=None, profiler=None):
+    """Write the map HTML (and the incremental build cache, if any); returns the output path"""
+    profiler = profiler or BuildProfiler(enabled=False)
+    profiler.begin("export", output=output)
+    m.save(output)
+    if build is not None:
+        build.save()
+    profiler.end()
+    return output
+
+
+def run(input_path="db.json", output=DEFAULT_OUTPUT, time_window=None, use_cache=True,
+        profile_report=None, profile_phase=None, tracemalloc_phase=None, verbose=True, data=None, **options):
+    """Load, build and export in one call; `options` are passed to build_map.
+
+    `data` is a (df, time_index) pair already returned by `load`, which is then skipped
+    (and missing from the profile). Returns a summary dict (output path, issue count,
+    traffic data, profile report).
+    """
+    profiler = BuildProfiler(enabled=bool(profile_report or profile_phase or tracemalloc_phase),
+                             profile_phase=profile_phase, tracemalloc_phase=tracemalloc_phase)
+    if data is None:
+        profiler.begin("load")
+        if verbose:
+            print("🔄 Loading dataset...")
+        data = load(input_path, time_window=time_window, use_cache=use_cache, verbose=verbose)
+    df, time_index = data
+    profiler.begin("traffic_model")
+    traffic_data = traffic_data_for(df, options.get("profiles", LOCATION_PROFILES), options.get("coords", LOCATION_COORDS),
+                                    seed=options.get("traffic_seed"),
+                                    density_weight=options.get("traffic_density_weight", 0.0),
+                                    radius_km=options.get("nearby_radius_km", 1.0))
+
+    m, build = build_map(df, traffic_data, time_index, output=output, profiler=profiler, verbose=verbose, **options)
+    export(m, output, build, profiler=profiler)
+
+    report = None
+    if profile_report:
+        report = profiler.write(profile_report)
+        print(f"⏱️ Build profile written to {profile_report}:")
+        print(profiler.summary())
+    return {"output": output, "issues": len(df), "traffic_data": traffic_data, "profile": report}
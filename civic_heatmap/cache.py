@@ -0,0 +1,155 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .loader import DEFAULT_CHUNKSIZE, load_issues
+
+# --------------------------
+# Columnar .npy cache next to the source feed
+# --------------------------
+# db.json -> db.json.cache/{meta.json, latitude.npy, ...}. Numeric columns, timestamps and
+# categorical codes are memory-mapped copy-on-write on warm loads (no parsing, no copies
+# until a value is assigned, and writes never reach the files); place/issue
+# text, and ids that are not numeric, are stored as codes into a table of unique strings.
+# Timezone-aware timestamps are stored as UTC and converted back using meta.json.
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".cache"
+_NUMERIC = {"latitude": np.float64, "longitude": np.float64}
+_TEXT = ["place", "issue"]
+COLUMNS = ["id", "place", "latitude", "longitude", "category", "severity", "issue", "timestamp"]
+
+
+def cache_dir_for(path):
+    return path + CACHE_SUFFIX
+
+
+def _source_key(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def read_cache_meta(path):
+    """Cache metadata if a cache exists for `path` and matches its current size/mtime, else None"""
+    meta_path = os.path.join(cache_dir_for(path), "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != CACHE_VERSION or meta.get("source") != _source_key(path):
+        return None
+    return meta
+
+
+def _save_text(directory, col, values):
+    codes, uniques = pd.factorize(values.astype(str))
+    np.save(os.path.join(directory, f"{col}.codes.npy"), codes.astype(np.int32))
+    np.save(os.path.join(directory, f"{col}.values.npy"), np.asarray(uniques, dtype=str))
+
+
+def _write_columns(directory, df, meta):
+    missing = [col for col in COLUMNS if col not in df]
+    if missing:
+        raise ValueError(f"feed is missing {', '.join(missing)}; not caching an incomplete schema")
+    for col, dtype in _NUMERIC.items():
+        np.save(os.path.join(directory, f"{col}.npy"), df[col].to_numpy(dtype=dtype))
+
+    # Integer (or float) ids stay numeric and memory-mapped; any other id is stored as text
+    ids = df["id"]
+    if pd.api.types.is_integer_dtype(ids) or pd.api.types.is_float_dtype(ids):
+        meta["id"] = "int64" if pd.api.types.is_integer_dtype(ids) else "float64"
+        np.save(os.path.join(directory, "id.npy"), ids.to_numpy(dtype=meta["id"]))
+    else:
+        meta["id"] = "text"
+        _save_text(directory, "id", ids)
+
+    # Keep the loader's datetime unit so warm and cold frames are identical; tz-aware
+    # timestamps are saved as naive UTC with the timezone recorded in meta
+    timestamps = pd.to_datetime(df["timestamp"])
+    if timestamps.dt.tz is not None:
+        meta["timezone"] = str(timestamps.dt.tz)
+        timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+    np.save(os.path.join(directory, "timestamp.npy"), timestamps.to_numpy(dtype=timestamps.dtype))
+
+    for col in ("category", "severity"):
+        values = df[col] if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].astype("category")
+        np.save(os.path.join(directory, f"{col}.codes.npy"), values.cat.codes.to_numpy())
+        meta["categoricals"][col] = [str(c) for c in values.cat.categories]
+
+    for col in _TEXT:
+        _save_text(directory, col, df[col])
+
+
+def write_cache(path, df):
+    """Write `df` as a columnar cache for `path`; the directory is swapped in atomically"""
+    target = cache_dir_for(path)
+    tmp = target + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    meta = {"version": CACHE_VERSION, "source": _source_key(path), "rows": len(df), "categoricals": {}}
+    try:
+        _write_columns(tmp, df, meta)
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+    return target
+
+
+def read_cache(path, meta=None):
+    """Load the cached issue frame; numeric/timestamp/categorical columns stay memory-mapped copy-on-write"""
+    meta = meta or read_cache_meta(path)
+    if meta is None:
+        raise FileNotFoundError(f"No up-to-date cache for {path}")
+    directory = cache_dir_for(path)
+
+    def mmap(name):
+        return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="c")
+
+    def text(col):
+        uniques = np.load(os.path.join(directory, f"{col}.values.npy")).astype(object)
+        codes = mmap(f"{col}.codes")
+        return uniques[codes] if len(uniques) else np.array([], dtype=object)
+
+    columns = {col: mmap(col) for col in _NUMERIC}
+    columns["id"] = text("id") if meta["id"] == "text" else mmap("id")
+    columns["timestamp"] = mmap("timestamp")
+    if meta.get("timezone"):
+        columns["timestamp"] = pd.DatetimeIndex(columns["timestamp"]).tz_localize("UTC").tz_convert(meta["timezone"])
+    for col in _TEXT:
+        columns[col] = text(col)
+    for col, categories in meta["categoricals"].items():
+        columns[col] = pd.Categorical.from_codes(mmap(f"{col}.codes"), categories,
+                                                 ordered=(col == "severity"))
+
+    return pd.DataFrame({col: columns[col] for col in COLUMNS}, copy=False)
+
+
+def load_issues_cached(path, chunksize=DEFAULT_CHUNKSIZE, on_chunk=None, refresh=False):
+    """Warm path: memory-map the columnar cache. Cold path: stream-parse the feed and write the cache.
+
+    With `refresh` the feed is parsed and the cache is neither read nor written. A cache that
+    cannot be written only costs the next load a parse. Returns (df, "warm" | "cold").
+    """
+    if refresh:
+        return load_issues(path, chunksize=chunksize, on_chunk=on_chunk), "cold"
+    meta = read_cache_meta(path)
+    if meta is not None:
+        return read_cache(path, meta), "warm"
+
+    df = load_issues(path, chunksize=chunksize, on_chunk=on_chunk)
+    try:
+        write_cache(path, df)
+    except (OSError, ValueError, TypeError) as e:
+        print("⚠️ Could not write columnar cache:", e)
+    return df, "cold"
@@ -0,0 +1,236 @@
+"""Command line entry point
+
+    python -m civic_heatmap build -i db.json -o map.html --layers issues heatmap --last-days 7
+    python -m civic_heatmap shards -i db.json -o region_maps --regions districts --workers 2
+    python -m civic_heatmap stats -i db.json --hours 8-11 --weekdays 0-4
+    python -m civic_heatmap traffic --seed 7 --density-weight 0.3
+    python -m civic_heatmap traffic --forecast
+    python -m civic_heatmap serve --port 8765
+
+Each command imports only what it needs: `traffic` never loads folium (nor pandas unless
+--density-weight is given), `stats` never loads folium.
+"""
+import argparse
+import json
+import sys
+
+DEFAULT_INPUT = "db.json"
+
+
+def _ints(parts, text):
+    try:
+        return [int(part) for part in parts]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected integers, got {text!r}") from None
+
+
+def hour_range(text):
+    """argparse type: "8-11" -> (8, 11), hours 0-24 ("22-2" wraps past midnight)"""
+    parts = text.split("-")
+    if len(parts) != 2:
+        raise argparse.ArgumentTypeError(f"expected an hour range such as 8-11, got {text!r}")
+    start, end = _ints(parts, text)
+    if not (0 <= start <= 24 and 0 <= end <= 24):
+        raise argparse.ArgumentTypeError(f"hours must be between 0 and 24, got {text!r}")
+    return start, end
+
+
+def weekday_set(text):
+    """argparse type: "0-4" (inclusive range) or "5,6" (list) -> weekdays, Monday = 0"""
+    if "-" in text:
+        parts = text.split("-")
+        if len(parts) != 2:
+            raise argparse.ArgumentTypeError(f"expected a weekday range such as 0-4, got {text!r}")
+        start, end = _ints(parts, text)
+        days = range(start, end + 1)
+    else:
+        days = tuple(_ints(text.split(","), text))
+    if not days or not all(0 <= day <= 6 for day in days):
+        raise argparse.ArgumentTypeError(f"weekdays must be between 0 and 6, got {text!r}")
+    return days
+
+
+def time_window_from_args(args):
+    """Window spec for temporal.apply_time_window, or None when no window option is set"""
+    if args.last_days is None and not any((args.start, args.end, args.hours, args.weekdays)):
+        return None
+    window = {"start": args.start, "end": args.end}
+    if args.last_days is not None:
+        # Combined with the other options: the trailing days narrow start/end
+        window["last_days"] = args.last_days
+    if args.hours:
+        window["hours"] = args.hours
+    if args.weekdays:
+        window["weekdays"] = args.weekdays
+    return window
+
+
+def _add_input_options(parser):
+    parser.add_argument("-i", "--input", default=DEFAULT_INPUT, help="issue feed (JSON array or JSONL)")
+    parser.add_argument("--no-cache", action="store_true", help="always parse JSON, ignore the columnar cache")
+    window = parser.add_argument_group("time window")
+    window.add_argument("--last-days", type=float, help="only issues from the N days before the newest issue")
+    window.add_argument("--start", help="window start (inclusive), e.g. 2025-09-01")
+    window.add_argument("--end", help="window end (exclusive)")
+    window.add_argument("--hours", type=hour_range, help="daily hour range, e.g. 8-11 (22-2 wraps past midnight)")
+    window.add_argument("--weekdays", type=weekday_set, help="weekday range or list, Monday = 0, e.g. 0-4 or 5,6")
+
+
+# --------------------------
+# Commands
+# --------------------------
+def cmd_build(args):
+    from .build import ALL_LAYERS, run
+
+    layers = args.layers or ALL_LAYERS
+    summary = run(
+        args.input, args.output, time_window=time_window_from_args(args), use_cache=not args.no_cache,
+        profile_report=args.profile, profile_phase=args.profile_phase, tracemalloc_phase=args.tracemalloc_phase,
+        layers=layers, issue_layer_mode=args.mode, tile_dir=args.tile_dir, render_workers=args.workers,
+        build_cache=args.build_cache, live_traffic_url=args.live_url,
+        traffic_seed=args.traffic_seed, traffic_density_weight=args.traffic_density_weight,
+        heatmap_preaggregate=args.preaggregate is not None, heatmap_cell_shape=args.preaggregate or "grid",
+        heat_dir=args.heat_dir,
+    )
+    print(f"🎉 Map with {summary['issues']} issues saved as {summary['output']}")
+
+
+def cmd_shards(args):
+    from .build import ALL_LAYERS
+    from .shards import build_shards
+
+    build_shards(
+        args.input, args.output, regions=args.regions, workers=args.workers,
+        time_window=time_window_from_args(args), use_cache=not args.no_cache,
+        layers=args.layers or ALL_LAYERS, issue_layer_mode=args.mode,
+        incremental=args.incremental,
+        heatmap_preaggregate=args.preaggregate is not None, heatmap_cell_shape=args.preaggregate or "grid",
+    )
+
+
+def cmd_stats(args):
+    from .cache import load_issues_cached
+    from .stats import IssueStats
+    from .temporal import TemporalIndex, apply_time_window
+
+    df, _ = load_issues_cached(args.input, refresh=args.no_cache)
+    window = time_window_from_args(args)
+    if window:
+        df = apply_time_window(df, TemporalIndex(df["timestamp"]), window)
+    stats = IssueStats.from_frame(df)
+    json.dump({
+        "total": stats.total,
+        "by_category": stats.by_category(),
+        "by_severity": stats.by_severity(),
+    }, sys.stdout, indent=2)
+    print()
+
+
+def cmd_traffic(args):
+    from .congestion import CongestionModel
+    from .traffic import traffic_snapshot
+
+    model = CongestionModel(seed=args.seed)
+    if args.density_weight:
+        # Only this option needs the issue feed (and pandas)
+        from .cache import load_issues_cached
+        model.set_issue_density(load_issues_cached(args.input)[0], weight=args.density_weight)
+
+    if args.forecast:
+        matrix = model.forecast()
+        json.dump({
+            "hours": list(range(24)),
+            "locations": model.names,
+            "congestion": matrix.tolist(),
+            "levels": [model.level_counts(row) for row in matrix],
+        }, sys.stdout, ensure_ascii=False)
+        print()
+        return
+    snapshot = traffic_snapshot(model.traffic_data(args.hour))
+    if not args.popups:
+        for location in snapshot["locations"]:
+            del location["popup"]
+    json.dump(snapshot, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+
+
+def cmd_serve(args):
+    from .live import main as live_main
+
+    live_main(args.live_args, prog="civic_heatmap serve")
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog="civic_heatmap", description="Delhi civic issue heatmap")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="build the HTML map")
+    _add_input_options(build)
+    build.add_argument("-o", "--output", default="optimized_delhi_traffic_map.html")
+    build.add_argument("--layers", nargs="+", choices=["issues", "traffic", "heatmap", "legend"],
+                       help="layers to include (default: all)")
+    build.add_argument("--mode", default="markers", choices=["markers", "payload", "tiles", "viewport"],
+                       help="issue layer output mode")
+    build.add_argument("--tile-dir", default="issue_tiles", help="tile output folder for --mode tiles")
+    build.add_argument("--workers", type=int, default=1, help="worker processes preparing new and changed issues")
+    build.add_argument("--preaggregate", nargs="?", const="grid", choices=["grid", "hex"],
+                       help="pre-aggregate the heatmap into per-zoom grid/hex cells")
+    build.add_argument("--heat-dir", default="heat_levels", help="folder for --preaggregate zoom levels")
+    build.add_argument("--build-cache", help="incremental build cache file (default: none)")
+    build.add_argument("--traffic-seed", type=int, help="seed for the congestion model's random draws")
+    build.add_argument("--traffic-density-weight", type=float, default=0.0,
+                       help="blend this share of traffic-issue density into congestion")
+    build.add_argument("--live-url", help="live traffic service URL the page should poll/stream from")
+    build.add_argument("--profile", metavar="REPORT.json", help="write a per-phase profile report")
+    build.add_argument("--profile-phase", help="also dump a cProfile .prof for this phase")
+    build.add_argument("--tracemalloc-phase", help="also dump tracemalloc top allocations for this phase")
+    build.set_defaults(func=cmd_build)
+
+    shards = commands.add_parser("shards", help="one map per region plus an index page")
+    _add_input_options(shards)
+    shards.add_argument("-o", "--output", default="region_maps", help="output folder")
+    shards.add_argument("--regions", default="districts",
+                        help='"districts" (Delhi districts) or a JSON file of {name: {"bounds": ...}}')
+    shards.add_argument("--workers", type=int, default=1, help="shards rendered concurrently")
+    shards.add_argument("--layers", nargs="+", choices=["issues", "traffic", "heatmap", "legend"],
+                        help="layers to include (default: all)")
+    shards.add_argument("--mode", default="markers", choices=["markers", "payload", "tiles", "viewport"],
+                        help="issue layer output mode")
+    shards.add_argument("--preaggregate", nargs="?", const="grid", choices=["grid", "hex"],
+                        help="pre-aggregate the heatmap into per-zoom grid/hex cells")
+    shards.add_argument("--incremental", action="store_true", help="keep a build cache per shard")
+    shards.set_defaults(func=cmd_shards)
+
+    stats = commands.add_parser("stats", help="print issue counts as JSON (no map)")
+    _add_input_options(stats)
+    stats.set_defaults(func=cmd_stats)
+
+    traffic = commands.add_parser("traffic", help="print a traffic snapshot as JSON (no issue data)")
+    traffic.add_argument("--popups", action="store_true", help="include popup HTML per location")
+    traffic.add_argument("--seed", type=int, help="seed for the congestion model's random draws")
+    traffic.add_argument("--hour", type=int, help="hour of day to model (default: now)")
+    traffic.add_argument("--forecast", action="store_true", help="24-hour x location congestion matrix instead")
+    traffic.add_argument("--density-weight", type=float, default=0.0,
+                         help="blend this share of traffic-issue density from --input into congestion")
+    traffic.add_argument("-i", "--input", default=DEFAULT_INPUT, help="issue feed for --density-weight")
+    traffic.set_defaults(func=cmd_traffic)
+
+    # Options (and --help) are left to civic_heatmap.live's own parser, see main()
+    serve = commands.add_parser("serve", help="run the live traffic service (options as civic_heatmap.live)",
+                                add_help=False)
+    serve.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    parser = make_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "serve":
+        args.live_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+from datetime import datetime
+
+import numpy as np
+
+from .profiles import LOCATION_PROFILES, LOCATION_COORDS
+from .traffic import CONGESTION_LEVELS, CONGESTION_THRESHOLDS, get_congestion_status
+
+# --------------------------
+# Vectorized congestion model
+# --------------------------
+# Same rules as the original per-location loop (base level, a peak-hour boost range that
+# depends on the location type, an off-peak range and +/-5 jitter, clipped to 5-95), but
+# profiles are held as arrays and every location (or every hour x location) is drawn at
+# once from one seeded Generator. numpy only, so traffic-only runs stay pandas-free.
+BASE_CONGESTION = 20
+PEAK_BOOST = {
+    "commercial_hub": (40, 65),
+    "medical_complex": (45, 70),
+    "market_area": (35, 60),
+}
+DEFAULT_PEAK_BOOST = (25, 50)
+OFF_PEAK_BOOST = (5, 30)
+JITTER = 5
+MIN_CONGESTION, MAX_CONGESTION = 5, 95
+# Status dict per level code (CONGESTION_LEVELS order), shared by all locations
+LEVEL_STATUS = [get_congestion_status(t) for t in [0] + CONGESTION_THRESHOLDS]
+
+
+class CongestionModel:
+    """Congestion for many monitored locations from array-form profiles.
+
+    Holds a (locations x 24) peak-hour mask, per-location peak boost ranges and coordinates.
+    `set_issue_density` optionally blends in how many traffic issues were reported near
+    each location.
+    """
+
+    def __init__(self, profiles=LOCATION_PROFILES, coords=LOCATION_COORDS, seed=None):
+        self.names = list(profiles)
+        self.profiles = [profiles[n] for n in self.names]
+        self.lat = np.array([coords[n]["lat"] for n in self.names], dtype=float)
+        self.lng = np.array([coords[n]["lng"] for n in self.names], dtype=float)
+        self.peak_mask = np.zeros((len(self.names), 24), dtype=bool)
+        for i, profile in enumerate(self.profiles):
+            for start, end in profile["peak_hours"]:
+                self.peak_mask[i, np.arange(start, end + 1) % 24] = True
+        boost = np.array([PEAK_BOOST.get(p["type"], DEFAULT_PEAK_BOOST) for p in self.profiles],
+                         dtype=np.int64).reshape(-1, 2)
+        self.peak_low, self.peak_high = boost[:, 0], boost[:, 1]
+        self.density = np.zeros(len(self.names))
+        self.density_weight = 0.0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return len(self.names)
+
+    def set_issue_density(self, df, weight=0.3, radius_km=1.0, category="traffic"):
+        """Blend in the share of `category` issues reported within `radius_km` of each location.
+
+        Each issue counts towards its nearest location only; the busiest location scores 1.
+        Returns the per-location issue counts.
+        """
+        from .spatial import SpatialIndex
+
+        counts = np.zeros(len(self), dtype=np.int64)
+        if len(self) and len(df):
+            rows = (df["category"] == category).to_numpy()
+            nearest, dist = SpatialIndex(self.lat, self.lng).nearest(
+                df["latitude"].to_numpy(dtype=float)[rows], df["longitude"].to_numpy(dtype=float)[rows])
+            counts = np.bincount(nearest[dist <= radius_km], minlength=len(self))
+        self.density = counts / counts.max() if counts.any() else np.zeros(len(self))
+        self.density_weight = weight
+        return counts
+
+    def _draw(self, in_peak):
+        """Congestion for a boolean peak array whose last axis is the location"""
+        low = np.where(in_peak, self.peak_low, OFF_PEAK_BOOST[0])
+        high = np.where(in_peak, self.peak_high, OFF_PEAK_BOOST[1])
+        congestion = BASE_CONGESTION + self.rng.integers(low, high + 1)
+        congestion = congestion + self.rng.integers(-JITTER, JITTER + 1, size=in_peak.shape)
+        if self.density_weight:
+            density_level = MIN_CONGESTION + (MAX_CONGESTION - MIN_CONGESTION) * self.density
+            congestion = np.rint((1 - self.density_weight) * congestion + self.density_weight * density_level)
+        return np.clip(congestion, MIN_CONGESTION, MAX_CONGESTION).astype(np.int64)
+
+    def congestion(self, hour=None):
+        """Congestion percentage per location for `hour` (default: now)"""
+        if hour is None:
+            hour = datetime.now().hour
+        return self._draw(self.peak_mask[:, hour % 24])
+
+    def forecast(self, hours=range(24)):
+        """(hours x locations) congestion matrix in one draw"""
+        hours = np.asarray(hours) % 24
+        return self._draw(self.peak_mask[:, hours].T)
+
+    @staticmethod
+    def levels(congestion):
+        """Level code per value (index into CONGESTION_LEVELS)"""
+        return np.searchsorted(CONGESTION_THRESHOLDS, congestion, side="right")
+
+    @classmethod
+    def colors(cls, congestion):
+        """Status color per value"""
+        return np.array([s["color"] for s in LEVEL_STATUS])[cls.levels(congestion)]
+
+    def traffic_data(self, hour=None):
+        """Records in the generate_dynamic_traffic_data format for `hour` (default: now)"""
+        congestion = self.congestion(hour)
+        levels = self.levels(congestion)
+        updated = datetime.now().strftime("%H:%M:%S")
+        return [
+            {
+                "name": name,
+                "lat": lat,
+                "lng": lng,
+                "congestion": c,
+                "status": LEVEL_STATUS[level],
+                "profile": profile,
+                "last_updated": updated,
+            }
+            for name, lat, lng, c, level, profile in zip(
+                self.names, self.lat.tolist(), self.lng.tolist(), congestion.tolist(), levels.tolist(),
+                self.profiles)
+        ]
+
+    def level_counts(self, congestion):
+        """{level: count} for a congestion array of any shape"""
+        counts = np.bincount(self.levels(congestion).ravel(), minlength=len(CONGESTION_LEVELS))
+        return {level: int(n) for level, n in zip(CONGESTION_LEVELS, counts)}
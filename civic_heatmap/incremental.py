@@ -0,0 +1,174 @@
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .render import prepare_issue_columns, issue_marker_js
+from .stats import IssueStats
+
+# --------------------------
+# Incremental rebuild: cache per-record fragments between map builds
+# --------------------------
+CACHE_VERSION = 6
+HASHED_COLUMNS = ["place", "latitude", "longitude", "category", "severity", "issue", "timestamp"]
+# Everything prepare_issue_columns returns except coordinates, which are read straight from df
+FRAGMENT_COLUMNS = ["category", "severity_color", "icon_color", "icon", "tooltip", "heat_weight", "popup_row"]
+# Emitted per-record marker JS (render.issue_marker_js); None until a markers-mode build renders it
+MARKER_JS_COLUMN = "marker_js"
+
+
+def prepare_records(df, marker_js=False):
+    """prepare_issue_columns for `df`, plus each record's marker JS line with `marker_js`"""
+    cols = prepare_issue_columns(df)
+    if marker_js:
+        cols[MARKER_JS_COLUMN] = np.array(issue_marker_js(cols), dtype=object)
+    return cols
+
+
+def records_digest(ids, hashes):
+    """Digest of a set of (id, content hash) records, independent of their order"""
+    pairs = pd.util.hash_pandas_object(pd.DataFrame({"id": np.asarray(ids), "hash": hashes}), index=False)
+    return hashlib.sha1(np.sort(pairs.to_numpy()).tobytes()).hexdigest()
+
+
+def record_hashes(df):
+    """64-bit content hash per record (vectorized, independent of row position)"""
+    cols = [c for c in HASHED_COLUMNS if c in df]
+    frame = df[cols].copy()
+    for col in ("category", "severity"):
+        if col in frame:
+            # Hash the label, not the categorical code, so a new category doesn't invalidate everything
+            frame[col] = frame[col].astype(str)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+class IncrementalBuild:
+    """Build manifest of rendered records: ids, content hashes and cached render fragments.
+
+    `update(df)` re-renders only new or changed records, reuses cached fragments (and the
+    marker JS emitted for them) for the rest and adjusts the IssueStats cube by the difference.
+    `changes` then describes what differs from the cached build, for outputs that are
+    updated in place (issue tiles).
+    """
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.records = None
+        self.digest = None
+        self.stats = IssueStats.empty()
+        self.last_update = {"new": 0, "changed": 0, "removed": 0, "reused": 0, "marker_js": 0}
+        self.changes = None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "rb") as f:
+                    cached = pickle.load(f)
+                if cached.get("version") == CACHE_VERSION:
+                    self.records = cached["records"]
+                    self.digest = cached["digest"]
+                    self.stats = cached["stats"]
+            except Exception as e:
+                print("⚠️ Ignoring unreadable build cache:", e)
+
+    def update(self, df, marker_js=False, prepare=prepare_records):
+        """Return prepared issue columns for `df`, rendering only what changed since the last build.
+
+        New and changed records go through `prepare(fresh_df, marker_js)`. With `marker_js`,
+        the columns also carry one marker JS line per record; reused records cached by a
+        build in another mode get theirs from their cached columns.
+        """
+        hashes = record_hashes(df)
+        ids = pd.Index(df["id"])
+        keyed = ids.is_unique
+        if not keyed:
+            # Without unique ids records cannot be matched between builds
+            self.records = None
+            self.stats = IssueStats.empty()
+
+        old = self.records
+        gone = None
+        if old is None:
+            dirty = np.ones(len(df), dtype=bool)
+            pos = None
+            n_changed = 0
+            removed = pd.Index([])
+        else:
+            # Row position of each incoming id in the cached manifest (-1 for new ids)
+            pos = old.index.get_indexer(ids)
+            known = pos >= 0
+            same = np.zeros(len(df), dtype=bool)
+            same[known] = old["hash"].to_numpy()[pos[known]] == hashes[known]
+            dirty = ~same
+            n_changed = int((known & dirty).sum())
+            removed = old.index.difference(ids)
+
+            # Take back the old contribution of changed and removed records
+            gone = old.loc[removed.append(ids[known & dirty])]
+            self.stats = self.stats - IssueStats.from_arrays(gone["category"], gone["severity"], gone["timestamp"])
+
+        fresh_df = df[dirty]
+        fresh = prepare(fresh_df, marker_js) if len(fresh_df) else None
+        severity = df["severity"].astype(str).to_numpy()
+        if fresh is not None:
+            self.stats = self.stats + IssueStats.from_frame(fresh_df)
+
+        cols = {
+            "lat": df["latitude"].to_numpy(dtype=float),
+            "lon": df["longitude"].to_numpy(dtype=float),
+        }
+        cached_keys = FRAGMENT_COLUMNS + [MARKER_JS_COLUMN]
+        for key in cached_keys:
+            values = np.empty(len(df), dtype=float if key == "heat_weight" else object)
+            if pos is not None:
+                values[same] = old[key].to_numpy()[pos[same]]
+            if fresh is not None:
+                values[dirty] = fresh.get(key)
+            cols[key] = values
+
+        n_rendered = 0
+        if marker_js:
+            # Records cached by a build in another mode have no line yet
+            missing = np.flatnonzero(np.equal(cols[MARKER_JS_COLUMN], None))
+            if missing.size:
+                cols[MARKER_JS_COLUMN][missing] = issue_marker_js(cols, missing)
+            n_rendered = int(missing.size + dirty.sum())
+
+        if keyed:
+            # Changed records' new rows and the old coordinates of changed and removed ones;
+            # "since" is the digest of the cached build (None when there was none)
+            self.changes = {
+                "since": self.digest if gone is not None else None,
+                "digest": records_digest(ids, hashes),
+                "rows": np.flatnonzero(dirty),
+                "old_lat": gone["latitude"].to_numpy(dtype=float) if gone is not None else np.empty(0),
+                "old_lon": gone["longitude"].to_numpy(dtype=float) if gone is not None else np.empty(0),
+            }
+            self.records = pd.DataFrame(
+                {"hash": hashes, "severity": severity, "timestamp": df["timestamp"].to_numpy(),
+                 "latitude": cols["lat"], "longitude": cols["lon"], **{k: cols[k] for k in cached_keys}},
+                index=ids,
+            )
+            self.digest = self.changes["digest"]
+        else:
+            self.changes = None
+        if not marker_js:
+            del cols[MARKER_JS_COLUMN]
+        self.last_update = {
+            "new": int(dirty.sum()) - n_changed,
+            "changed": n_changed,
+            "removed": len(removed),
+            "reused": int((~dirty).sum()),
+            "marker_js": n_rendered,
+        }
+        return cols
+
+    def save(self):
+        """Persist the manifest next to the output (skipped when ids are not unique)"""
+        if not self.cache_path or self.records is None:
+            return
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": CACHE_VERSION, "records": self.records, "digest": self.digest,
+                         "stats": self.stats}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.cache_path)
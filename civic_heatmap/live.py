@@ -0,0 +1,211 @@
+"""Live traffic service: recomputes congestion on a schedule and serves it as JSON / SSE
+
+    python -m civic_heatmap.live --port 8765 --interval 60 --issues db.json
+
+Endpoints (CORS-enabled so a saved map opened from disk can reach them):
+    GET /traffic.json   latest snapshot
+    GET /events         Server-Sent Events stream, one `data:` message per refresh
+"""
+import argparse
+import asyncio
+import json
+
+from branca.element import Template, MacroElement
+
+from .profiles import LOCATION_PROFILES, LOCATION_COORDS
+from .congestion import CongestionModel
+from .traffic import traffic_snapshot
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_INTERVAL = 60
+
+_CORS_HEADERS = (
+    "Access-Control-Allow-Origin: *\r\n"
+    "Access-Control-Allow-Methods: GET, OPTIONS\r\n"
+    "Cache-Control: no-cache\r\n"
+)
+
+
+class LiveTrafficService:
+    """Keeps the latest traffic snapshot and pushes each refresh to SSE subscribers"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL, notes=None, profiles=LOCATION_PROFILES, coords=LOCATION_COORDS,
+                 model=None):
+        self.interval = interval
+        self.notes = notes or {}
+        # Profile arrays are built once; each refresh is a single vectorized draw
+        self.model = model or CongestionModel(profiles, coords)
+        self.snapshot = None
+        self._payload = b""
+        self._subscribers = set()
+        self.refresh()
+
+    def refresh(self):
+        """Recompute congestion for every location and notify subscribers"""
+        traffic_data = self.model.traffic_data()
+        self.snapshot = traffic_snapshot(traffic_data, self.notes)
+        self._payload = json.dumps(self.snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        for queue in list(self._subscribers):
+            # Slow clients only ever get the newest snapshot
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(self._payload)
+
+    async def run_scheduler(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.refresh()
+
+    # --------------------------
+    # Minimal HTTP handling
+    # --------------------------
+    async def handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            # Drain headers; nothing in them changes the response
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            method, path = (parts[0], parts[1].split("?")[0]) if len(parts) >= 2 else ("", "")
+
+            if method == "OPTIONS":
+                writer.write(("HTTP/1.1 204 No Content\r\n" + _CORS_HEADERS + "\r\n").encode())
+            elif method == "GET" and path == "/traffic.json":
+                writer.write((
+                    "HTTP/1.1 200 OK\r\n" + _CORS_HEADERS
+                    + "Content-Type: application/json; charset=utf-8\r\n"
+                    + f"Content-Length: {len(self._payload)}\r\nConnection: close\r\n\r\n"
+                ).encode() + self._payload)
+            elif method == "GET" and path == "/events":
+                await self._stream_events(writer)
+                return
+            else:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _stream_events(self, writer):
+        writer.write(("HTTP/1.1 200 OK\r\n" + _CORS_HEADERS
+                      + "Content-Type: text/event-stream\r\nConnection: keep-alive\r\n\r\n").encode())
+        queue = asyncio.Queue(maxsize=1)
+        queue.put_nowait(self._payload)
+        self._subscribers.add(queue)
+        try:
+            while True:
+                payload = await queue.get()
+                writer.write(b"data: " + payload + b"\n\n")
+                await writer.drain()
+        finally:
+            self._subscribers.discard(queue)
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle, host, port)
+        scheduler = asyncio.create_task(self.run_scheduler())
+        print(f"🚦 Live traffic service on http://{host}:{port}/traffic.json (refresh every {self.interval}s)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            scheduler.cancel()
+
+
+# --------------------------
+# Client-side updater for the saved map
+# --------------------------
+class LiveTrafficUpdater(MacroElement):
+    """Update traffic markers and the `traffic-stats` legend block in place from the service.
+
+    Uses Server-Sent Events when available and falls back to polling /traffic.json.
+    """
+
+    _template = Template("""
+{% macro script(this, kwargs) %}
+(function() {
+    var root = {{ this.url|tojson }};
+    var markers = { {%- for name, marker in this.markers.items() %}
+        {{ name|tojson }}: {{ marker.get_name() }},{% endfor %}
+    };
+
+    function setText(id, value) {
+        var el = document.getElementById(id);
+        if (el) { el.textContent = value; }
+    }
+    function apply(snapshot) {
+        snapshot.locations.forEach(function(l) {
+            var marker = markers[l.name];
+            if (!marker) { return; }
+            marker.setStyle({fillColor: l.status.color});
+            marker.setTooltipContent(l.tooltip);
+            marker.setPopupContent(l.popup);
+        });
+        setText('traffic-heavy', snapshot.levels.Heavy);
+        setText('traffic-moderate', snapshot.levels.Moderate);
+        setText('traffic-light', snapshot.levels.Light);
+        setText('live-update-time', 'Last updated: ' + snapshot.updated);
+    }
+    function poll() {
+        fetch(root + '/traffic.json', {cache: 'no-store'})
+            .then(function(r) { return r.json(); })
+            .then(apply)
+            .catch(function() {});
+    }
+
+    if ({{ this.use_sse|tojson }} && window.EventSource) {
+        var source = new EventSource(root + '/events');
+        source.onmessage = function(e) { apply(JSON.parse(e.data)); };
+        source.onerror = function() {
+            // Service unreachable or SSE blocked: fall back to polling
+            source.close();
+            setInterval(poll, {{ this.interval_ms }});
+        };
+    } else {
+        poll();
+        setInterval(poll, {{ this.interval_ms }});
+    }
+})();
+{% endmacro %}
+""")
+
+    def __init__(self, url, markers, interval=DEFAULT_INTERVAL, use_sse=True):
+        super().__init__()
+        self._name = "LiveTrafficUpdater"
+        self.url = url.rstrip("/")
+        self.markers = markers
+        self.interval_ms = int(interval * 1000)
+        self.use_sse = use_sse
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Serve live traffic snapshots for the Delhi map")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="refresh period in seconds")
+    parser.add_argument("--issues", help="issue feed (db.json / JSONL) used for the nearby-issue popup notes")
+    parser.add_argument("--seed", type=int, help="seed for the congestion model's random draws")
+    parser.add_argument("--density-weight", type=float, default=0.0,
+                        help="blend this share of traffic-issue density from --issues into congestion")
+    args = parser.parse_args(argv)
+
+    notes = None
+    model = CongestionModel(seed=args.seed)
+    if args.issues:
+        from .loader import load_issues
+        from .traffic import location_issue_notes
+        df = load_issues(args.issues)
+        notes = location_issue_notes(df)
+        if args.density_weight:
+            model.set_issue_density(df, weight=args.density_weight)
+
+    service = LiveTrafficService(interval=args.interval, notes=notes, model=model)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("👋 Live traffic service stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .incremental import prepare_records
+
+# --------------------------
+# Parallel issue preparation
+# --------------------------
+# Workers run the whole per-record pipeline of incremental.prepare_records (colors, icons,
+# formatted times, tooltips, JSON popup rows and, in markers mode, the marker JS line) on
+# one contiguous slice of the raw issue rows each. Slices are pickled once per worker; the
+# raw columns are small next to what is prepared from them, and the parent only
+# concatenates the results in slice order.
+
+
+def _pool_context():
+    """Prefer fork so workers inherit imports.
+
+    spawn re-imports the __main__ module, so on spawn-only platforms the caller's
+    entry point has to be guarded by `if __name__ == "__main__":`.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+
+def prepare_records_parallel(df, marker_js=False, workers=4):
+    """Parallel counterpart of incremental.prepare_records (same columns, same order, for any worker count)"""
+    if workers <= 1 or len(df) < workers:
+        return prepare_records(df, marker_js)
+    parts = [df.iloc[rows] for rows in np.array_split(np.arange(len(df)), workers)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+        # map() yields in submission order, so the merged columns never depend on scheduling
+        results = list(pool.map(prepare_records, parts, [marker_js] * workers))
+    return {key: np.concatenate([part[key] for part in results]) for key in results[0]}
@@ -0,0 +1,89 @@
+import json
+from branca.element import Template, MacroElement
+
+from .popups import popup_styles, ISSUE_POPUP_JS, ISSUE_MARKER_JS
+from .render import issue_labels
+
+# --------------------------
+# Compact GeoJSON payload: every issue serialized exactly once
+# --------------------------
+# Short property keys (i=id, p=place, c=category, s=severity, d=issue, t=time) keep the
+# per-record cost to a few dozen bytes
+
+
+def issues_to_geojson(df, coord_precision=5):
+    """Build a GeoJSON FeatureCollection with one Point feature per issue"""
+    lat = df["latitude"].round(coord_precision).tolist()
+    lon = df["longitude"].round(coord_precision).tolist()
+    times = df["timestamp"].dt.strftime("%d %b %Y, %I:%M %p").tolist()
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [x, y]},
+            "properties": {"i": i, "p": p, "c": c, "s": s, "d": d, "t": t},
+        }
+        for y, x, i, p, c, s, d, t in zip(
+            lat, lon, df["id"].tolist(), df["place"].astype(str).tolist(),
+            issue_labels(df["category"]).tolist(), issue_labels(df["severity"]).tolist(),
+            df["issue"].astype(str).tolist(), times,
+        )
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+def dump_payload(obj):
+    """Compact JSON that is safe to inline inside a <script> block"""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).replace("</", "<\\/")
+
+
+# --------------------------
+# Client-side layer builder
+# --------------------------
+class IssuePayloadLayer(MacroElement):
+    """Populate existing category FeatureGroups and a MarkerCluster from one shared payload.
+
+    The FeatureGroups/MarkerCluster are still created in Python so LayerControl lists them;
+    only their contents (markers, tooltips, popups) are generated in the browser, and
+    popup HTML is rendered from a single template the first time a popup opens
+    (styled by PopupStyles).
+    """
+
+    _template = Template("""
+{% macro script(this, kwargs) %}
+(function() {
+    var data = {{ this.payload }};
+    var styles = {{ this.styles }};
+    var layers = { {%- for cat, layer in this.category_layers.items() %}
+        {{ cat|tojson }}: {{ layer.get_name() }},{% endfor %}
+    };
+    var cluster = {{ this.marker_cluster.get_name() }};
+
+{{ this.popup_js }}
+{{ this.marker_js }}
+    var clusterMarkers = [];
+    data.features.forEach(function(f) {
+        var p = f.properties;
+        var ll = [f.geometry.coordinates[1], f.geometry.coordinates[0]];
+        var tip = issueTooltip(p);
+        var popup = function() { return popupHtml(p); };
+
+        var layer = layers[p.c];
+        if (layer) {
+            issueCircle(ll, sevColor(p.s), popup, tip).addTo(layer);
+        }
+        clusterMarkers.push(issueMarker(ll, iconColor(p.s), catIcon(p.c), popup, tip));
+    });
+    cluster.addLayers(clusterMarkers);
+})();
+{% endmacro %}
+""")
+
+    def __init__(self, df, category_layers, marker_cluster):
+        super().__init__()
+        self._name = "IssuePayloadLayer"
+        self.payload = dump_payload(issues_to_geojson(df))
+        self.styles = popup_styles()
+        self.popup_js = ISSUE_POPUP_JS
+        self.marker_js = ISSUE_MARKER_JS
+        self.category_layers = category_layers
+        self.marker_cluster = marker_cluster
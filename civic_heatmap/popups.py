@@ -0,0 +1,147 @@
+import json
+
+from branca.element import Template, MacroElement
+
+from .render import (
+    SEVERITY_COLORS, SEVERITY_ICON_COLORS, CATEGORY_ICONS, CATEGORY_COLORS,
+    DEFAULT_SEVERITY_COLOR, DEFAULT_CATEGORY_ICON, DEFAULT_CATEGORY_COLOR,
+)
+
+# --------------------------
+# Shared popup styling: one <style> block instead of inline styles per popup
+# --------------------------
+# Issue and traffic popups share the civic-popup/head/body/section classes; only
+# values that differ per record (traffic status color, congestion bar width) stay inline.
+_BASE_CSS = """
+.civic-popup { font-family: 'Segoe UI'; }
+.civic-issue { width: 280px; }
+.civic-issue .civic-head { color: white; padding: 8px; border-radius: 4px; }
+.civic-issue .civic-body { padding: 6px; background: #f8f9fa; border-radius: 4px; margin-top: 4px; }
+.civic-badge { color: white; padding: 1px 4px; border-radius: 8px; font-size: 11px; }
+.civic-muted { color: #7f8c8d; }
+.civic-traffic { width: 350px; }
+.civic-traffic .civic-head { color: white; padding: 12px; border-radius: 8px 8px 0 0; }
+.civic-traffic .civic-head h3 { margin: 0; display: flex; align-items: center; justify-content: space-between; }
+.civic-traffic .civic-head p { margin: 5px 0 0 0; opacity: 0.9; }
+.civic-traffic .civic-body { padding: 15px; background: #f8f9fa; border-radius: 0 0 8px 8px; }
+.civic-section { margin-bottom: 12px; }
+.civic-section h4 { margin: 0 0 6px 0; color: #2c3e50; }
+.civic-hours h4 { margin-bottom: 8px; }
+.civic-card { background: white; padding: 10px; border-radius: 6px; }
+.civic-status { border-left: 3px solid; }
+.civic-bar { background: #ecf0f1; height: 8px; border-radius: 4px; margin: 6px 0; }
+.civic-bar div { height: 8px; border-radius: 4px; }
+.civic-slot { margin: 4px 0; padding: 6px 10px; background: #f0f8ff; border-radius: 4px; border-left: 2px solid #2ecc71; }
+.civic-slot:first-child { background: #e8f5e8; }
+.civic-advice { padding: 10px; border-radius: 6px; border-left: 3px solid; }
+.civic-advice-high { background: #fff3cd; border-left-color: #ffc107; }
+.civic-advice-moderate { background: #d1ecf1; border-left-color: #17a2b8; }
+.civic-advice-low { background: #d4edda; border-left-color: #28a745; }
+"""
+
+
+def popup_css():
+    """Stylesheet for every popup on the page, including one color class per severity/category"""
+    rules = [_BASE_CSS.strip()]
+    for prefix, table, default in (("sev", SEVERITY_COLORS, DEFAULT_SEVERITY_COLOR),
+                                   ("cat", CATEGORY_COLORS, DEFAULT_CATEGORY_COLOR)):
+        rules += [f".civic-{prefix}-{key} {{ background: {color}; }}" for key, color in table.items()]
+        rules.append(f".civic-{prefix}-default {{ background: {default}; }}")
+    return "\n".join(rules)
+
+
+class PopupStyles(MacroElement):
+    """Inject the shared popup stylesheet into the page header (add once per map)"""
+
+    _template = Template("""
+{% macro header(this, kwargs) %}
+<style>
+{{ this.css }}
+</style>
+{% endmacro %}
+""")
+
+    def __init__(self):
+        super().__init__()
+        self._name = "PopupStyles"
+        self.css = popup_css()
+
+
+# --------------------------
+# Client-side issue popup template
+# --------------------------
+def popup_styles():
+    """Color/icon lookup tables the client-side popup renderer reads as `styles`"""
+    return json.dumps({
+        "sevColors": SEVERITY_COLORS,
+        "catColors": CATEGORY_COLORS,
+        "iconColors": SEVERITY_ICON_COLORS,
+        "catIcons": CATEGORY_ICONS,
+        "defaultSevColor": DEFAULT_SEVERITY_COLOR,
+        "defaultCatColor": DEFAULT_CATEGORY_COLOR,
+        "defaultCatIcon": DEFAULT_CATEGORY_ICON,
+    }, separators=(",", ":"))
+
+
+# Popup renderer shared by every client-side issue layer; expects a `styles` object in scope.
+# Markup only carries class names, the look comes from PopupStyles.
+ISSUE_POPUP_JS = """
+function esc(v) {
+    return String(v).replace(/[&<>"']/g, function(ch) {
+        return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[ch];
+    });
+}
+function sevColor(s) { return styles.sevColors[s] || styles.defaultSevColor; }
+function catColor(c) { return styles.catColors[c] || styles.defaultCatColor; }
+function iconColor(s) { return styles.iconColors[s] || 'blue'; }
+function catIcon(c) { return styles.catIcons[c] || styles.defaultCatIcon; }
+function sevClass(s) { return 'civic-sev-' + (styles.sevColors.hasOwnProperty(s) ? s : 'default'); }
+function catClass(c) { return 'civic-cat-' + (styles.catColors.hasOwnProperty(c) ? c : 'default'); }
+function popupHtml(p) {
+    return '<div class="civic-popup civic-issue"><div class="civic-head ' + sevClass(p.s) + '">' +
+        '<b>📍 ' + esc(p.p) + '</b><br>#' + esc(p.i) + ' • ' + esc(p.t) + '</div><div class="civic-body">' +
+        '<b>Category:</b> <span class="civic-badge ' + catClass(p.c) + '">' + esc(p.c) + '</span><br>' +
+        '<b>Severity:</b> <span class="civic-badge ' + sevClass(p.s) + '">' + esc(p.s) + '</span><br>' +
+        '<b>Issue:</b> ' + esc(p.d) + '<br></div></div>';
+}
+function issueTooltip(p) { return esc(p.p) + ': ' + esc(String(p.d).slice(0, 40)) + '...'; }
+"""
+
+# Marker builders shared by every issue layer: the category-layer CircleMarker and the
+# AwesomeMarkers cluster Marker. `popup` is a function, so popup HTML is built on open.
+ISSUE_MARKER_JS = """
+function issueCircle(ll, fill, popup, tip) {
+    return L.circleMarker(ll, {radius: 5, color: 'white', weight: 1, fillColor: fill, fillOpacity: 0.8})
+        .bindPopup(popup, {maxWidth: 320}).bindTooltip(tip);
+}
+function issueMarker(ll, markerColor, icon, popup, tip) {
+    return L.marker(ll, {icon: L.AwesomeMarkers.icon({markerColor: markerColor, iconColor: 'white',
+                                                      icon: icon, prefix: 'fa'})})
+        .bindPopup(popup, {maxWidth: 320}).bindTooltip(tip);
+}
+"""
+
+
+class IssuePopups(MacroElement):
+    """Global issue popup renderer.
+
+    `html(r)` renders one of prepare_issue_columns' `popup_row` arrays
+    ([id, place, category, severity, issue, time]); HTML is only built when a popup opens.
+    """
+
+    _template = Template("""
+{% macro script(this, kwargs) %}
+var {{ this.get_name() }} = (function() {
+    var styles = {{ this.styles }};
+{{ this.popup_js }}
+    function html(r) { return popupHtml({i: r[0], p: r[1], c: r[2], s: r[3], d: r[4], t: r[5]}); }
+    return {html: html};
+})();
+{% endmacro %}
+""")
+
+    def __init__(self):
+        super().__init__()
+        self._name = "IssuePopups"
+        self.styles = popup_styles()
+        self.popup_js = ISSUE_POPUP_JS
@@ -0,0 +1,89 @@
+# --------------------------
+# Enhanced Location Profiles with Unique Characteristics
+# --------------------------
+LOCATION_PROFILES = {
+    "Connaught Place": {
+        "type": "commercial_hub",
+        "peak_hours": [(8, 11), (14, 17), (19, 22)],
+        "optimal_work": ["06:00-08:00 (Before office rush)", "11:30-13:30 (Lunch break window)", "17:30-19:00 (Evening gap)"],
+        "avoid_completely": ["08:00-11:00", "19:00-22:00"],
+        "specialty": "Metro connectivity issues during rush"
+    },
+    "Chandni Chowk": {
+        "type": "market_area", 
+        "peak_hours": [(10, 13), (15, 19)],
+        "optimal_work": ["07:00-09:30 (Before market opens)", "13:30-14:30 (Afternoon break)", "19:30-21:00 (After market closure)"],
+        "avoid_completely": ["10:00-13:00", "15:00-19:00"],
+        "specialty": "Heavy pedestrian traffic, narrow lanes"
+    },
+    "AIIMS": {
+        "type": "medical_complex",
+        "peak_hours": [(8, 12), (14, 18)],
+        "optimal_work": ["06:30-08:00 (Early morning)", "12:30-13:30 (Lunch gap)", "18:30-20:00 (After OPD)"],
+        "avoid_completely": ["08:00-12:00", "14:00-18:00"],
+        "specialty": "Emergency vehicle priority, patient traffic"
+    },
+    "Karol Bagh": {
+        "type": "shopping_district",
+        "peak_hours": [(11, 14), (16, 20)],
+        "optimal_work": ["07:30-10:30 (Morning window)", "14:30-15:30 (Brief afternoon)", "20:30-22:00 (Evening close)"],
+        "avoid_completely": ["11:00-14:00", "16:00-20:00"],
+        "specialty": "Wedding season affects traffic patterns"
+    },
+    "Lajpat Nagar": {
+        "type": "residential_market",
+        "peak_hours": [(9, 12), (17, 19)],
+        "optimal_work": ["07:00-09:00 (Residential quiet)", "12:30-16:30 (Extended afternoon)", "19:30-21:00 (Evening calm)"],
+        "avoid_completely": ["09:00-12:00", "17:00-19:00"],
+        "specialty": "Local market dependency, school timings matter"
+    },
+    "Saket": {
+        "type": "upscale_commercial",
+        "peak_hours": [(10, 13), (18, 21)],
+        "optimal_work": ["08:00-10:00 (Mall opening)", "13:30-17:30 (Extended midday)", "21:30-23:00 (Late evening)"],
+        "avoid_completely": ["10:00-13:00", "18:00-21:00"],
+        "specialty": "Mall traffic, multiplex shows impact timing"
+    },
+    "Dwarka": {
+        "type": "planned_residential",
+        "peak_hours": [(7, 10), (17, 20)],
+        "optimal_work": ["06:00-07:00 (Very early)", "10:30-16:30 (Long midday)", "20:30-22:30 (Late evening)"],
+        "avoid_completely": ["07:00-10:00", "17:00-20:00"],
+        "specialty": "Metro line dependency, airport traffic affects Sub City"
+    },
+    "Rohini": {
+        "type": "suburban_residential",
+        "peak_hours": [(7, 9), (18, 20)],
+        "optimal_work": ["06:30-07:00 (Dawn window)", "09:30-17:30 (Full day availability)", "20:30-22:00 (Night window)"],
+        "avoid_completely": ["07:00-09:00", "18:00-20:00"],
+        "specialty": "School zones affect morning/evening traffic"
+    },
+    "Janakpuri": {
+        "type": "middle_class_hub",
+        "peak_hours": [(8, 10), (17, 19)],
+        "optimal_work": ["07:00-08:00 (Early start)", "10:30-16:30 (Stable midday)", "19:30-21:30 (Extended evening)"],
+        "avoid_completely": ["08:00-10:00", "17:00-19:00"],
+        "specialty": "District center activities, local business hours"
+    },
+    "Rajouri Garden": {
+        "type": "mixed_commercial",
+        "peak_hours": [(8, 11), (16, 19)],
+        "optimal_work": ["06:30-08:00 (Pre-rush)", "11:30-15:30 (Mid-day stretch)", "19:30-21:00 (Post-rush)"],
+        "avoid_completely": ["08:00-11:00", "16:00-19:00"],
+        "specialty": "Metro station congestion, market timing conflicts"
+    }
+}
+
+# Monitored coordinates for each profile (focused on Delhi region only)
+LOCATION_COORDS = {
+    "Connaught Place": {"lat": 28.6315, "lng": 77.2167},
+    "Chandni Chowk": {"lat": 28.6562, "lng": 77.2300},
+    "AIIMS": {"lat": 28.5672, "lng": 77.2100},
+    "Karol Bagh": {"lat": 28.6510, "lng": 77.1900},
+    "Lajpat Nagar": {"lat": 28.5687, "lng": 77.2433},
+    "Saket": {"lat": 28.5246, "lng": 77.2066},
+    "Dwarka": {"lat": 28.5483, "lng": 77.0656},
+    "Rohini": {"lat": 28.7170, "lng": 77.1100},
+    "Janakpuri": {"lat": 28.6215, "lng": 77.0913},
+    "Rajouri Garden": {"lat": 28.6420, "lng": 77.1240},
+}
@@ -0,0 +1,179 @@
+import cProfile
+import gc
+import json
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# --------------------------
+# Per-phase build instrumentation
+# --------------------------
+REPORT_VERSION = 1
+TRACEMALLOC_TOP = 25
+
+
+def peak_rss_mb():
+    """Process high-water RSS in MB (None where the resource module is unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def current_rss_mb():
+    """Current RSS in MB from /proc (Linux only, None elsewhere)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+class BuildProfiler:
+    """Record wall/CPU time, RSS, live object counts and output bytes per build phase.
+
+    Phases are either delimited with `begin(name)` (which ends the previous phase, handy
+    in a flat script) or wrapped with `with profiler.phase(name):`. The phase named
+    `profile_phase` additionally runs under cProfile, and `tracemalloc_phase` under
+    tracemalloc; both dumps land in `dump_dir`. Disabled profilers cost nothing.
+    """
+
+    def __init__(self, enabled=True, profile_phase=None, tracemalloc_phase=None, dump_dir="."):
+        self.enabled = enabled
+        self.profile_phase = profile_phase
+        self.tracemalloc_phase = tracemalloc_phase
+        self.dump_dir = dump_dir
+        self.phases = []
+        self.dumps = {}
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self._t0 = time.perf_counter()
+        self._current = None
+
+    # --------------------------
+    # Phase boundaries
+    # --------------------------
+    def begin(self, name, output=None):
+        """End the running phase (if any) and start `name`; `output` is a file whose size is recorded"""
+        self.end()
+        if not self.enabled:
+            return
+        current = {
+            "name": name,
+            "output": output,
+            "wall": time.perf_counter(),
+            "cpu": time.process_time(),
+            "objects": len(gc.get_objects()),
+            "rss_mb": current_rss_mb(),
+            "profiler": None,
+        }
+        if name == self.tracemalloc_phase and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            current["tracemalloc"] = True
+        if name == self.profile_phase:
+            current["profiler"] = cProfile.Profile()
+            current["profiler"].enable()
+        self._current = current
+
+    def end(self):
+        """Close the running phase and append its record"""
+        current, self._current = self._current, None
+        if current is None:
+            return
+        if current["profiler"] is not None:
+            current["profiler"].disable()
+        wall = time.perf_counter() - current["wall"]
+        cpu = time.process_time() - current["cpu"]
+        record = {
+            "phase": current["name"],
+            "wall_s": round(wall, 4),
+            "cpu_s": round(cpu, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "rss_mb": current_rss_mb(),
+            "rss_delta_mb": None,
+            "objects": len(gc.get_objects()),
+            "objects_delta": None,
+            "output_bytes": None,
+        }
+        record["objects_delta"] = record["objects"] - current["objects"]
+        if record["rss_mb"] is not None and current["rss_mb"] is not None:
+            record["rss_delta_mb"] = round(record["rss_mb"] - current["rss_mb"], 1)
+        if current["output"] and os.path.exists(current["output"]):
+            record["output_bytes"] = os.path.getsize(current["output"])
+
+        if current["profiler"] is not None:
+            self.dumps[current["name"]] = self._dump_cprofile(current["name"], current["profiler"])
+        if current.get("tracemalloc"):
+            self.dumps[current["name"] + " (tracemalloc)"] = self._dump_tracemalloc(current["name"])
+        self.phases.append(record)
+
+    @contextmanager
+    def phase(self, name, output=None):
+        self.begin(name, output)
+        try:
+            yield self
+        finally:
+            self.end()
+
+    # --------------------------
+    # Dumps and report
+    # --------------------------
+    def _dump_cprofile(self, name, profiler):
+        path = os.path.join(self.dump_dir, f"profile-{_slug(name)}.prof")
+        profiler.dump_stats(path)
+        return path
+
+    def _dump_tracemalloc(self, name):
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        path = os.path.join(self.dump_dir, f"tracemalloc-{_slug(name)}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# {name}: traced current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB\n")
+            for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP]:
+                f.write(f"{stat}\n")
+        return path
+
+    def report(self):
+        """JSON-ready report of every finished phase"""
+        self.end()
+        return {
+            "version": REPORT_VERSION,
+            "started": self.started,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "total_wall_s": round(time.perf_counter() - self._t0, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "phases": self.phases,
+            "dumps": self.dumps,
+        }
+
+    def write(self, path):
+        """Write the report to `path` and return it"""
+        report = self.report()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return report
+
+    def summary(self):
+        """One line per phase for the console"""
+        return "\n".join(
+            f"   {p['phase']:<16} {p['wall_s']:>8.3f}s  rss {p['rss_mb'] or 0:>7.1f} MB  "
+            f"objects {p['objects_delta']:+,}" + (f"  {p['output_bytes']:,} bytes" if p["output_bytes"] else "")
+            for p in self.phases
+        )
@@ -0,0 +1,69 @@
+import json
+import re
+
+import numpy as np
+
+from .profiles import LOCATION_PROFILES, LOCATION_COORDS
+
+# --------------------------
+# Regions for sharded builds
+# --------------------------
+# A region is a dict with "bounds" ([[south, west], [north, east]]) and optionally "center",
+# "title", "profiles" and "coords". Without "profiles", the LOCATION_PROFILES whose
+# coordinates fall inside the bounds are used. Other cities come from a JSON file of the
+# same shape ({name: region}), each with its own profiles and coords.
+DELHI_DISTRICTS = {
+    "north": {"title": "North Delhi", "bounds": [[28.66, 76.8], [28.9, 77.6]]},
+    "central": {"title": "Central Delhi", "bounds": [[28.6, 77.15], [28.66, 77.6]]},
+    "west": {"title": "West Delhi", "bounds": [[28.4, 76.8], [28.66, 77.15]]},
+    "south": {"title": "South Delhi", "bounds": [[28.4, 77.15], [28.6, 77.6]]},
+}
+
+
+def in_bounds(lat, lon, bounds):
+    """Boolean mask of the points inside [[south, west], [north, east]] (edges included)"""
+    (south, west), (north, east) = bounds
+    return (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+
+
+def resolve_region(name, region, profiles=LOCATION_PROFILES, coords=LOCATION_COORDS):
+    """Fill in center, title, profiles and coords for one region definition"""
+    (south, west), (north, east) = region["bounds"]
+    if "profiles" in region:
+        profiles = region["profiles"]
+        coords = region["coords"]
+    else:
+        profiles = {n: p for n, p in profiles.items()
+                    if in_bounds(coords[n]["lat"], coords[n]["lng"], region["bounds"])}
+        coords = {n: coords[n] for n in profiles}
+    return {
+        "name": name,
+        "slug": re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_"),
+        "title": region.get("title", name),
+        "bounds": [[south, west], [north, east]],
+        "center": region.get("center", [(south + north) / 2, (west + east) / 2]),
+        "profiles": profiles,
+        "coords": coords,
+    }
+
+
+def load_regions(spec="districts"):
+    """Resolved regions from "districts" (DELHI_DISTRICTS), a JSON file path, or a {name: region} dict"""
+    if spec == "districts":
+        spec = DELHI_DISTRICTS
+    elif isinstance(spec, str):
+        with open(spec, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+    return [resolve_region(name, region) for name, region in spec.items()]
+
+
+def assign_regions(lat, lon, regions):
+    """Index of the first region containing each point, -1 outside all of them"""
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    assigned = np.full(len(lat), -1, dtype=np.int32)
+    for i, region in enumerate(regions):
+        # First match wins, so points on a shared edge land in exactly one shard
+        hit = (assigned < 0) & in_bounds(lat, lon, region["bounds"])
+        assigned[hit] = i
+    return assigned
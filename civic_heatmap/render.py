@@ -0,0 +1,151 @@
+import html
+import json
+
+import numpy as np
+from branca.element import Template, MacroElement
+
+from .loader import UNKNOWN_LABEL
+
+# --------------------------
+# Shared color / icon tables (Phase 3 helpers read these too)
+# --------------------------
+SEVERITY_COLORS = {"high": "#d73027", "medium": "#fc8d59", "low": "#4575b4"}
+SEVERITY_ICON_COLORS = {"high": "red", "medium": "orange", "low": "blue"}
+SEVERITY_HEAT_WEIGHTS = {"high": 5, "medium": 3, "low": 1}
+CATEGORY_ICONS = {"traffic": "car", "pollution": "smog", "water": "tint", "waste": "trash", "electricity": "bolt"}
+CATEGORY_COLORS = {"traffic": "#e74c3c", "pollution": "#9b59b6", "water": "#3498db", "waste": "#f39c12", "electricity": "#f1c40f"}
+
+DEFAULT_SEVERITY_COLOR = "#999999"
+DEFAULT_CATEGORY_ICON = "exclamation-circle"
+DEFAULT_CATEGORY_COLOR = "#95a5a6"
+
+
+def issue_labels(series):
+    """Column as strings, missing values as UNKNOWN_LABEL (matching IssueStats)"""
+    return series.astype(object).where(series.notna(), UNKNOWN_LABEL).astype(str)
+
+
+def _lookup(series, table, default):
+    """Map a column through a dict in one pass (categoricals map per category, not per row)"""
+    return series.astype(str).map(table).fillna(default).astype(str)
+
+
+# --------------------------
+# Column-wise preparation of everything Phase 7/8 need
+# --------------------------
+def prepare_issue_columns(df):
+    """Compute colors, icons, times, tooltips, heat weights and popup rows for all issues at once"""
+    severity = issue_labels(df["severity"])
+    category = issue_labels(df["category"])
+    place = df["place"].astype(str)
+    issue = df["issue"].astype(str)
+
+    sev_color = _lookup(severity, SEVERITY_COLORS, DEFAULT_SEVERITY_COLOR)
+    formatted_time = df["timestamp"].dt.strftime("%d %b %Y, %I:%M %p").astype(str)
+
+    # Popup fields as one compact JSON row per record; the HTML itself is rendered in the
+    # browser when a popup opens, and the row is shared by the circle and cluster markers
+    dumps = json.dumps
+    popup_row = [
+        dumps(row, ensure_ascii=False, separators=(",", ":"))
+        for row in zip(df["id"].tolist(), place.tolist(), category.tolist(), severity.tolist(),
+                       issue.tolist(), formatted_time.tolist())
+    ]
+
+    return {
+        "lat": df["latitude"].to_numpy(dtype=float),
+        "lon": df["longitude"].to_numpy(dtype=float),
+        "category": category.to_numpy(),
+        "severity_color": sev_color.to_numpy(),
+        "icon_color": severity.map(SEVERITY_ICON_COLORS).fillna("blue").to_numpy(),
+        "icon": _lookup(category, CATEGORY_ICONS, DEFAULT_CATEGORY_ICON).to_numpy(),
+        "tooltip": (place + ": " + issue.str.slice(0, 40) + "...").to_numpy(),
+        "heat_weight": severity.map(SEVERITY_HEAT_WEIGHTS).fillna(1).to_numpy(dtype=float),
+        "popup_row": np.array(popup_row, dtype=object),
+    }
+
+
+def heat_points(cols):
+    """[[lat, lon, weight], ...] for HeatMap straight from the prepared arrays"""
+    return np.column_stack((cols["lat"], cols["lon"], cols["heat_weight"])).tolist()
+
+
+# --------------------------
+# Emit Phase 7 layers from the prepared arrays
+# --------------------------
+# One line of JS per issue, calling the `a` helper of CategoryFragmentLayer. A line only
+# depends on its own record, so lines are cached between builds (IncrementalBuild) and
+# rendered in worker processes (parallel) without any index bookkeeping.
+def issue_marker_js(cols, rows=None):
+    """JS line per issue (or per index in `rows`) adding its CircleMarker and cluster Marker"""
+    take = (lambda key: cols[key]) if rows is None else (lambda key: cols[key][rows])
+    dumps = json.dumps
+    return [
+        f"a([{lat!r},{lon!r}],{dumps(fill)},{dumps(icon_color)},{dumps(icon)},"
+        f"{dumps(html.escape(tooltip), ensure_ascii=False)},{row});".replace("</", "<\\/")
+        for lat, lon, fill, icon_color, icon, tooltip, row in zip(
+            take("lat").tolist(), take("lon").tolist(), take("severity_color"), take("icon_color"),
+            take("icon"), take("tooltip"), take("popup_row"),
+        )
+    ]
+
+
+class CategoryFragmentLayer(MacroElement):
+    """Run pre-rendered issue_marker_js lines for one category FeatureGroup and the shared MarkerCluster.
+
+    Add it to the MarkerCluster so it runs after both the cluster and the category layers exist.
+    """
+
+    _template = Template("""
+{% macro script(this, kwargs) %}
+(function() {
+    var layer = {{ this.layer.get_name() }}, cluster = [];
+{{ this.marker_js }}
+    function a(ll, fill, iconColor, icon, tip, r) {
+        var p = function() { return {{ this.popups.get_name() }}.html(r); };
+        issueCircle(ll, fill, p, tip).addTo(layer);
+        cluster.push(issueMarker(ll, iconColor, icon, p, tip));
+    }
+{{ this.fragment }}
+    {{ this.marker_cluster.get_name() }}.addLayers(cluster);
+})();
+{% endmacro %}
+""")
+
+    def __init__(self, layer, marker_cluster, fragment, popups):
+        # Imported here because popups reads the color/icon tables defined above
+        from .popups import ISSUE_MARKER_JS
+
+        super().__init__()
+        self._name = "CategoryFragmentLayer"
+        self.marker_js = ISSUE_MARKER_JS
+        self.layer = layer
+        self.marker_cluster = marker_cluster
+        self.fragment = fragment
+        self.popups = popups
+
+
+def add_fragment_layers(category_layers, marker_cluster, marker_js, categories):
+    """One CategoryFragmentLayer per category layer from per-issue JS lines; returns the IssuePopups renderer"""
+    # Imported here because popups reads the color/icon tables defined above
+    from .popups import IssuePopups
+
+    # Popup rows travel inside the lines; the shared renderer only turns them into HTML
+    popups = IssuePopups()
+    popups.add_to(marker_cluster)
+    marker_js = np.asarray(marker_js, dtype=object)
+    for cat, layer in category_layers.items():
+        lines = marker_js[categories == cat]
+        if len(lines):
+            marker_cluster.add_child(CategoryFragmentLayer(layer, marker_cluster, "\n".join(lines), popups))
+    return popups
+
+
+def add_issue_markers(cols, category_layers, marker_cluster):
+    """Add one CircleMarker (category layer) and one cluster Marker per issue.
+
+    Uses the cached `marker_js` lines from IncrementalBuild when present; both markers
+    share a popup rendered in the browser on first open. Returns the IssuePopups renderer.
+    """
+    marker_js = cols["marker_js"] if "marker_js" in cols else issue_marker_js(cols)
+    return add_fragment_layers(category_layers, marker_cluster, marker_js, cols["category"])
@@ -0,0 +1,150 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .loader import DEFAULT_CHUNKSIZE, iter_issue_chunks
+from .regions import assign_regions, load_regions
+
+# --------------------------
+# Sharded builds: one map per region plus an index page
+# --------------------------
+# The feed is streamed once in fixed-size chunks and split into one JSONL file per region,
+# so partitioning never holds more than a chunk. Each shard is then loaded and rendered on
+# its own (optionally in worker processes), which bounds peak memory by the largest shard
+# instead of the whole dataset.
+DEFAULT_OUT_DIR = "region_maps"
+SHARD_DIR_NAME = "shards"
+INDEX_NAME = "index.html"
+
+
+def partition_issues(path, regions, shard_dir, chunksize=DEFAULT_CHUNKSIZE):
+    """Split the feed into `<shard_dir>/<slug>.jsonl` per region.
+
+    Returns ({slug: issue count}, issues outside every region).
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    paths = {r["slug"]: os.path.join(shard_dir, f"{r['slug']}.jsonl") for r in regions}
+    counts = dict.fromkeys(paths, 0)
+    outside = 0
+    files = {slug: open(p, "w", encoding="utf-8") for slug, p in paths.items()}
+    try:
+        for chunk in iter_issue_chunks(path, chunksize):
+            assigned = assign_regions(chunk["latitude"], chunk["longitude"], regions)
+            outside += int((assigned < 0).sum())
+            for i, region in enumerate(regions):
+                rows = chunk[assigned == i]
+                if len(rows):
+                    rows.to_json(files[region["slug"]], orient="records", lines=True, date_format="iso")
+                    counts[region["slug"]] += len(rows)
+    finally:
+        for f in files.values():
+            f.close()
+    return counts, outside
+
+
+def build_shard(region, shard_path, out_dir, options):
+    """Render one region's shard to `<out_dir>/<slug>.html`; returns a summary dict"""
+    # Imported here so partitioning (and worker start-up under spawn) doesn't load folium
+    from .build import run
+    from .profiling import peak_rss_mb
+
+    slug = region["slug"]
+    options = dict(options)
+    # Each shard gets its own tile and heat level folders (linked relative to its page)
+    options["tile_dir"] = os.path.join(out_dir, f"{slug}_tiles")
+    options["heat_dir"] = os.path.join(out_dir, f"{slug}_heat")
+    if options.pop("incremental", False):
+        options["build_cache"] = os.path.join(out_dir, SHARD_DIR_NAME, f"{slug}.build.pkl")
+
+    t0 = time.perf_counter()
+    output = os.path.join(out_dir, f"{slug}.html")
+    summary = run(shard_path, output, center=region["center"], bounds=region["bounds"],
+                  profiles=region["profiles"], coords=region["coords"], title=region["title"],
+                  verbose=False, **options)
+    return {
+        "slug": slug,
+        "title": region["title"],
+        "bounds": region["bounds"],
+        "page": f"{slug}.html",
+        "issues": summary["issues"],
+        "html_bytes": os.path.getsize(output),
+        "seconds": round(time.perf_counter() - t0, 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def write_index(out_dir, shards, title="Civic Issue Maps"):
+    """Overview map with one clickable rectangle per region, linking to its shard page"""
+    import folium
+
+    bounds = [[min(s["bounds"][0][0] for s in shards), min(s["bounds"][0][1] for s in shards)],
+              [max(s["bounds"][1][0] for s in shards), max(s["bounds"][1][1] for s in shards)]]
+    m = folium.Map(tiles='CartoDB positron')
+    m.fit_bounds(bounds)
+    for shard in shards:
+        link = (f'<a href="{shard["page"]}" target="_top">{shard["title"]}</a>' if shard.get("page")
+                else shard["title"])
+        folium.Rectangle(
+            bounds=shard["bounds"],
+            color='#3498db' if shard.get("page") else '#95a5a6',
+            weight=2,
+            fill=True,
+            fill_opacity=0.1,
+            popup=folium.Popup(f"<b>{link}</b><br>📋 {shard['issues']} issues", max_width=250),
+            tooltip=f"{shard['title']}: {shard['issues']} issues",
+        ).add_to(m)
+
+    rows = "".join(
+        f'<li><a href="{s["page"]}">{s["title"]}</a> ({s["issues"]})</li>' if s.get("page")
+        else f'<li>{s["title"]} (no issues)</li>'
+        for s in shards
+    )
+    m.get_root().html.add_child(folium.Element(f"""
+<div style="position:fixed; top:20px; right:20px; background:rgba(255,255,255,0.95); padding:12px 16px;
+            border-radius:10px; z-index:9999; font-size:12px; box-shadow: 0 6px 20px rgba(0,0,0,0.1);">
+    <h4 style="margin: 0 0 8px 0; color: #2c3e50;">🗺️ {title}</h4>
+    <ul style="margin: 0; padding-left: 18px;">{rows}</ul>
+</div>
+"""))
+    output = os.path.join(out_dir, INDEX_NAME)
+    m.save(output)
+    return output
+
+
+def build_shards(input_path, out_dir=DEFAULT_OUT_DIR, regions="districts", workers=1,
+                 chunksize=DEFAULT_CHUNKSIZE, verbose=True, **options):
+    """Partition the feed by region, render every non-empty shard and write the index page.
+
+    `regions` is anything load_regions accepts; `options` are passed to build.run per shard
+    (plus `incremental=True` for a per-shard build cache). Returns the shard summaries.
+    """
+    regions = load_regions(regions)
+    shard_dir = os.path.join(out_dir, SHARD_DIR_NAME)
+    counts, outside = partition_issues(input_path, regions, shard_dir, chunksize=chunksize)
+    if verbose:
+        print(f"🧭 {sum(counts.values())} issues in {len(regions)} regions ({outside} outside all regions)")
+
+    # Largest shards first so a small one is never the last job left running
+    todo = sorted((r for r in regions if counts[r["slug"]]), key=lambda r: -counts[r["slug"]])
+    jobs = [(r, os.path.join(shard_dir, f"{r['slug']}.jsonl"), out_dir, options) for r in todo]
+    if workers > 1 and len(jobs) > 1:
+        from .parallel import _pool_context
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+            results = list(pool.map(build_shard, *zip(*jobs)))
+    else:
+        results = [build_shard(*job) for job in jobs]
+
+    built = {r["slug"]: r for r in results}
+    shards = [built.get(r["slug"], {"slug": r["slug"], "title": r["title"], "bounds": r["bounds"], "issues": 0})
+              for r in regions]
+    if verbose:
+        for shard in shards:
+            if shard.get("page"):
+                print(f"   {shard['title']:<20} {shard['issues']:>9,} issues  {shard['html_bytes'] / 1e6:>7.2f} MB"
+                      f"  {shard['seconds']:>7.2f}s  rss {shard['peak_rss_mb'] or 0:.0f} MB")
+            else:
+                print(f"   {shard['title']:<20}   no issues, skipped")
+    index = write_index(out_dir, shards)
+    if verbose:
+        print(f"🎉 Index page saved as {index}")
+    return shards
@@ -0,0 +1,161 @@
+import numpy as np
+
+# --------------------------
+# Grid spatial index for issue / profile coordinates
+# --------------------------
+# City-scale distances use a local equirectangular projection around the data's
+# centre latitude; over Delhi-sized areas the error vs. haversine is well below 0.1%
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LON_EQUATOR = 111.320
+DEFAULT_CELL_KM = 0.5
+
+
+class SpatialIndex:
+    """Uniform-grid index over lat/lon points.
+
+    Points are sorted by grid cell once, so bounding-box and radius queries only touch
+    the cells they overlap (one searchsorted per grid row), and nearest-point lookups
+    search outward ring by ring from the query's cell instead of scanning every point.
+    """
+
+    def __init__(self, lat, lon, cell_km=DEFAULT_CELL_KM, ref_lat=None):
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.cell_km = float(cell_km)
+        self.ref_lat = float(np.mean(self.lat)) if ref_lat is None and self.lat.size else float(ref_lat or 0.0)
+        self._kx = KM_PER_DEG_LON_EQUATOR * np.cos(np.radians(self.ref_lat))
+
+        x, y = self.project(self.lat, self.lon)
+        self.x, self.y = x, y
+        if x.size:
+            self.col0 = int(np.floor(x.min() / self.cell_km))
+            self.row0 = int(np.floor(y.min() / self.cell_km))
+            self.ncols = int(np.floor(x.max() / self.cell_km)) - self.col0 + 1
+            self.nrows = int(np.floor(y.max() / self.cell_km)) - self.row0 + 1
+        else:
+            self.col0 = self.row0 = 0
+            self.ncols = self.nrows = 0
+
+        keys = self._cell_keys(x, y)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    def __len__(self):
+        return self.lat.size
+
+    # --------------------------
+    # Projection helpers
+    # --------------------------
+    def project(self, lat, lon):
+        """Local km coordinates (x east, y north)"""
+        return np.asarray(lon, dtype=float) * self._kx, np.asarray(lat, dtype=float) * KM_PER_DEG_LAT
+
+    def _cells(self, x, y):
+        col = np.floor(np.asarray(x) / self.cell_km).astype(np.int64) - self.col0
+        row = np.floor(np.asarray(y) / self.cell_km).astype(np.int64) - self.row0
+        return row, col
+
+    def _cell_keys(self, x, y):
+        row, col = self._cells(x, y)
+        return row * max(self.ncols, 1) + col
+
+    def _range_candidates(self, x_min, y_min, x_max, y_max):
+        """Indices of points in grid cells overlapping a km rectangle"""
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+        r0, c0 = self._cells(x_min, y_min)
+        r1, c1 = self._cells(x_max, y_max)
+        return self._block_candidates(int(r0), int(c0), int(r1), int(c1))
+
+    def _block_candidates(self, r0, c0, r1, c1):
+        """Indices of points in grid rows r0..r1 and columns c0..c1 (clipped to the grid)"""
+        r0, r1 = max(r0, 0), min(r1, self.nrows - 1)
+        c0, c1 = max(c0, 0), min(c1, self.ncols - 1)
+        if r0 > r1 or c0 > c1:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.arange(r0, r1 + 1)
+        lo = np.searchsorted(self.sorted_keys, rows * self.ncols + c0, side="left")
+        hi = np.searchsorted(self.sorted_keys, rows * self.ncols + c1, side="right")
+        return np.concatenate([self.order[a:b] for a, b in zip(lo, hi)])
+
+    # --------------------------
+    # Queries
+    # --------------------------
+    def query_bbox(self, south, west, north, east):
+        """Indices of points inside a lat/lon bounding box"""
+        (x0, x1), (y0, y1) = self.project([south, north], [west, east])
+        idx = self._range_candidates(x0, y0, x1, y1)
+        inside = ((self.lat[idx] >= south) & (self.lat[idx] <= north)
+                  & (self.lon[idx] >= west) & (self.lon[idx] <= east))
+        return np.sort(idx[inside])
+
+    def query_radius(self, lat, lon, radius_km, return_distance=False):
+        """Indices of points within `radius_km` of (lat, lon), nearest first"""
+        qx, qy = self.project(lat, lon)
+        idx = self._range_candidates(qx - radius_km, qy - radius_km, qx + radius_km, qy + radius_km)
+        dist = np.hypot(self.x[idx] - qx, self.y[idx] - qy)
+        keep = dist <= radius_km
+        idx, dist = idx[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return (idx[order], dist[order]) if return_distance else idx[order]
+
+    def _nearest_in_cell(self, row, col, qx, qy):
+        """Nearest targets for queries that share grid cell (row, col), by expanding ring search.
+
+        Every target outside the block of cells within r rings of the query cell is more
+        than r * cell_km away from any point of that cell, so once the block holds a
+        candidate at distance b, widening it to ceil(b / cell_km) rings is guaranteed
+        to contain the true nearest target.
+        """
+        # rings closer than the grid's edge are empty for queries outside it
+        r = max(-row, row - self.nrows + 1, -col, col - self.ncols + 1, 0)
+        while True:
+            cand = self._block_candidates(row - r, col - r, row + r, col + r)
+            if cand.size:
+                break
+            r += 1
+        d = np.hypot(self.x[cand] - qx[:, None], self.y[cand] - qy[:, None])
+        reach = int(np.ceil(d.min(axis=1).max() / self.cell_km))
+        if reach > r:
+            cand = self._block_candidates(row - reach, col - reach, row + reach, col + reach)
+            d = np.hypot(self.x[cand] - qx[:, None], self.y[cand] - qy[:, None])
+        best = d.argmin(axis=1)
+        return cand[best], d[np.arange(d.shape[0]), best]
+
+    def nearest(self, lat, lon):
+        """(index, distance_km) of the nearest indexed point for each query point"""
+        if not len(self):
+            raise ValueError("Cannot query nearest point in an empty index")
+
+        qx, qy = self.project(np.atleast_1d(lat), np.atleast_1d(lon))
+        row, col = self._cells(qx, qy)
+        idx = np.empty(qx.size, dtype=np.int64)
+        dist = np.empty(qx.size)
+        # group queries by cell so each occupied cell runs one ring search
+        order = np.lexsort((col, row))
+        row_s, col_s = row[order], col[order]
+        starts = np.flatnonzero(np.r_[True, (row_s[1:] != row_s[:-1]) | (col_s[1:] != col_s[:-1])])
+        for q in np.split(order, starts[1:]):
+            idx[q], dist[q] = self._nearest_in_cell(int(row[q[0]]), int(col[q[0]]), qx[q], qy[q])
+        return idx, dist
+
+
+# --------------------------
+# Profile helpers
+# --------------------------
+def build_profile_index(location_coords, cell_km=DEFAULT_CELL_KM):
+    """SpatialIndex over profile coordinates plus the matching list of profile names"""
+    names = list(location_coords)
+    lat = [location_coords[n]["lat"] for n in names]
+    lon = [location_coords[n]["lng"] for n in names]
+    return SpatialIndex(lat, lon, cell_km=cell_km), names
+
+
+def assign_nearest_profile(df, profile_index, names, max_km=None):
+    """Nearest profile name (and distance) for every issue; None beyond `max_km`"""
+    idx, dist = profile_index.nearest(df["latitude"].to_numpy(), df["longitude"].to_numpy())
+    assigned = np.asarray(names, dtype=object)[idx]
+    if max_km is not None:
+        assigned[dist > max_km] = None
+    return assigned, dist
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+
+from .loader import SEVERITY_LEVELS, KNOWN_CATEGORIES, UNKNOWN_LABEL
+from .temporal import wall_clock_ns
+
+# --------------------------
+# Single-pass statistics: category x severity x time-bucket counts
+# --------------------------
+DEFAULT_BUCKET = "D"
+
+
+def _bucket_ns(bucket):
+    """Bucket width in nanoseconds for fixed-width aliases such as D, h or 15min"""
+    return pd.Timedelta(bucket if bucket[:1].isdigit() else "1" + bucket).value
+
+
+def _codes(values, base_levels):
+    """Integer codes + level list for a column, without materializing boolean masks.
+
+    Missing values (and categorical code -1) get UNKNOWN_LABEL, so every row is counted.
+    """
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        levels = [str(c) for c in values.cat.categories]
+        missing = codes < 0
+        if missing.any():
+            if UNKNOWN_LABEL not in levels:
+                levels.append(UNKNOWN_LABEL)
+            codes = np.where(missing, levels.index(UNKNOWN_LABEL), codes)
+        return codes, levels
+    values = pd.Series(values, dtype=object)
+    values = values.where(values.notna(), UNKNOWN_LABEL).astype(str)
+    extra = sorted(set(values.unique()) - set(base_levels))
+    levels = list(base_levels) + extra
+    return pd.Categorical(values, categories=levels).codes, levels
+
+
+class IssueStats:
+    """Dense count cube over (category, severity, time bucket), built with one np.bincount.
+
+    Legend, layer names and dashboards read from this object instead of scanning the
+    DataFrame. Cubes can be added/subtracted so incremental builds only count the delta.
+    Rows without a timestamp are kept in `undated` (category x severity), so totals always
+    match the number of records; only by_time leaves them out.
+    """
+
+    def __init__(self, categories, severities, counts, bucket=DEFAULT_BUCKET, origin=0, undated=None):
+        self.categories = list(categories)
+        self.severities = list(severities)
+        self.counts = counts
+        self.bucket = bucket
+        self.origin = origin  # bucket index (since epoch) of counts[:, :, 0]
+        self.undated = (np.zeros(counts.shape[:2], dtype=np.int64) if undated is None else undated)
+
+    @classmethod
+    def empty(cls, categories=KNOWN_CATEGORIES, severities=SEVERITY_LEVELS, bucket=DEFAULT_BUCKET):
+        counts = np.zeros((len(categories), len(severities), 0), dtype=np.int64)
+        return cls(categories, severities, counts, bucket)
+
+    @classmethod
+    def from_arrays(cls, category, severity, timestamp, bucket=DEFAULT_BUCKET):
+        cat_codes, categories = _codes(category, KNOWN_CATEGORIES)
+        sev_codes, severities = _codes(severity, SEVERITY_LEVELS)
+        # Buckets follow the local calendar of tz-aware feeds, like TemporalIndex
+        ts = wall_clock_ns(timestamp)[0].view("datetime64[ns]")
+
+        n_c, n_s = len(categories), len(severities)
+        cell = cat_codes.astype(np.int64) * n_s + sev_codes
+        dated = ~np.isnat(ts)
+        undated = np.bincount(cell[~dated], minlength=n_c * n_s).reshape(n_c, n_s)
+        if not dated.any():
+            return cls(categories, severities, np.zeros((n_c, n_s, 0), dtype=np.int64), bucket, undated=undated)
+
+        bucket_ns = _bucket_ns(bucket)
+        t = ts[dated].view(np.int64) // bucket_ns
+        origin = int(t.min())
+        t -= origin
+        n_t = int(t.max()) + 1
+
+        flat = cell[dated] * n_t + t
+        counts = np.bincount(flat, minlength=n_c * n_s * n_t).reshape(n_c, n_s, n_t)
+        return cls(categories, severities, counts, bucket, origin, undated)
+
+    @classmethod
+    def from_frame(cls, df, bucket=DEFAULT_BUCKET):
+        return cls.from_arrays(df["category"], df["severity"], df["timestamp"], bucket)
+
+    # --------------------------
+    # Combining cubes (incremental updates)
+    # --------------------------
+    def _combine(self, other, sign):
+        if other.bucket != self.bucket:
+            raise ValueError(f"Cannot combine stats bucketed by {self.bucket!r} and {other.bucket!r}")
+        categories = self.categories + [c for c in other.categories if c not in self.categories]
+        severities = self.severities + [s for s in other.severities if s not in self.severities]
+        undated = np.zeros((len(categories), len(severities)), dtype=np.int64)
+        for part, factor in ((self, 1), (other, sign)):
+            ci = [categories.index(c) for c in part.categories]
+            si = [severities.index(s) for s in part.severities]
+            undated[np.ix_(ci, si)] += factor * part.undated
+
+        parts = [p for p in (self, other) if p.counts.shape[2]]
+        if not parts:
+            counts = np.zeros((len(categories), len(severities), 0), dtype=np.int64)
+            return IssueStats(categories, severities, counts, self.bucket, undated=undated)
+        origin = min(p.origin for p in parts)
+        end = max(p.origin + p.counts.shape[2] for p in parts)
+        counts = np.zeros((len(categories), len(severities), end - origin), dtype=np.int64)
+
+        for part, factor in ((self, 1), (other, sign)):
+            if not part.counts.shape[2]:
+                continue
+            ci = [categories.index(c) for c in part.categories]
+            si = [severities.index(s) for s in part.severities]
+            start = part.origin - origin
+            window = counts[:, :, start:start + part.counts.shape[2]]
+            window[np.ix_(ci, si)] += factor * part.counts
+
+        # Trim empty buckets at either end so subtraction doesn't grow the time axis forever
+        used = np.flatnonzero(counts.sum(axis=(0, 1)))
+        if used.size:
+            counts = counts[:, :, used[0]:used[-1] + 1]
+            origin += int(used[0])
+        else:
+            counts = counts[:, :, :0]
+        return IssueStats(categories, severities, counts, self.bucket, origin, undated)
+
+    def __add__(self, other):
+        return self._combine(other, +1)
+
+    def __sub__(self, other):
+        return self._combine(other, -1)
+
+    # --------------------------
+    # Read-side views
+    # --------------------------
+    def _category_severity(self):
+        """Category x severity counts, dated and undated"""
+        return self.counts.sum(axis=2) + self.undated
+
+    @property
+    def total(self):
+        return int(self._category_severity().sum())
+
+    def by_category(self):
+        """{category: count} for categories with at least one issue"""
+        totals = self._category_severity().sum(axis=1)
+        return {c: int(n) for c, n in zip(self.categories, totals) if n}
+
+    def by_severity(self):
+        totals = self._category_severity().sum(axis=0)
+        return {s: int(n) for s, n in zip(self.severities, totals)}
+
+    def severity_count(self, severity):
+        return self.by_severity().get(severity, 0)
+
+    def category_severity(self):
+        """Category x severity table as a DataFrame"""
+        return pd.DataFrame(self._category_severity(), index=self.categories, columns=self.severities)
+
+    def by_time(self):
+        """Issue count per time bucket, indexed by bucket start (undated issues left out)"""
+        bucket_ns = _bucket_ns(self.bucket)
+        n_t = self.counts.shape[2]
+        index = pd.to_datetime((self.origin + np.arange(n_t)) * bucket_ns)
+        return pd.Series(self.counts.sum(axis=(0, 1)), index=index)
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "severity": self.by_severity(),
+            "categories": self.by_category(),
+            "bucket": self.bucket,
+        }
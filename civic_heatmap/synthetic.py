@@ -0,0 +1,156 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from .loader import ISSUE_COLUMNS, KNOWN_CATEGORIES, SEVERITY_LEVELS
+from .profiles import LOCATION_PROFILES, LOCATION_COORDS
+
+# --------------------------
+# Seeded synthetic Delhi issue generator
+# --------------------------
+# Issues scatter around the LOCATION_PROFILES coordinates, with a category mix that depends
+# on the location type and timestamps that favour each location's peak hours. Rows are
+# produced in fixed-size blocks, each seeded from (seed, block number), so the same seed
+# gives the same records whatever the chunk size or total size asked for.
+BLOCK_SIZE = 1_000_000
+SPREAD_KM = 1.5
+PEAK_HOUR_SHARE = 0.6
+DEFAULT_START = "2025-01-01"
+DEFAULT_DAYS = 365
+KM_PER_DEG_LAT = 111.32
+# Whatever unit the loader's pd.to_datetime yields for ISO strings, so generated and
+# loaded frames compare equal
+_TIMESTAMP_DTYPE = pd.to_datetime(pd.Series(["2025-01-01T00:00:00"])).dtype
+
+ISSUE_TEXTS = {
+    "traffic": ["Heavy traffic during peak hours", "Traffic congestion near metro station",
+                "Traffic jam due to market crowd", "Metro construction causing congestion",
+                "Accident causing minor jam", "Minor traffic congestion near bus stops"],
+    "pollution": ["Air pollution due to vehicles", "Construction dust causing pollution",
+                  "Industrial smoke pollution", "Vehicular smoke affecting air quality"],
+    "water": ["Low water pressure reported", "Leaking water pipeline", "Waterlogging after rain",
+              "Frequent water supply interruptions"],
+    "waste": ["Overflowing dustbins", "Garbage not collected on time", "Waste collection delayed",
+              "Garbage dumped near park"],
+    "electricity": ["Frequent power cuts", "Streetlights not functioning", "Frequent transformer failures",
+                    "Power outages during evening hours"],
+}
+
+# Category weights (KNOWN_CATEGORIES order) per location type
+CATEGORY_MIX = {
+    "commercial_hub": [0.45, 0.2, 0.1, 0.15, 0.1],
+    "market_area": [0.4, 0.15, 0.1, 0.25, 0.1],
+    "shopping_district": [0.4, 0.15, 0.1, 0.2, 0.15],
+    "mixed_commercial": [0.35, 0.2, 0.15, 0.15, 0.15],
+    "upscale_commercial": [0.35, 0.15, 0.15, 0.15, 0.2],
+    "medical_complex": [0.4, 0.2, 0.15, 0.15, 0.1],
+}
+DEFAULT_CATEGORY_MIX = [0.2, 0.15, 0.25, 0.2, 0.2]  # residential areas
+SEVERITY_MIX = [0.45, 0.35, 0.2]  # SEVERITY_LEVELS order
+
+
+def _profile_tables(profiles, coords):
+    names = list(profiles)
+    lat = np.array([coords[n]["lat"] for n in names])
+    lon = np.array([coords[n]["lng"] for n in names])
+    mix = np.array([CATEGORY_MIX.get(profiles[n]["type"], DEFAULT_CATEGORY_MIX) for n in names])
+    peak_hours = [
+        np.unique(np.concatenate([np.arange(a, b + 1) for a, b in profiles[n]["peak_hours"]]) % 24)
+        for n in names
+    ]
+    return names, lat, lon, mix / mix.sum(axis=1, keepdims=True), peak_hours
+
+
+def _generate_block(n, first_id, rng, tables, start_ns, days):
+    names, plat, plon, mix, peak_hours = tables
+    profile = rng.integers(0, len(names), n)
+
+    # Normal scatter around the profile location, in km converted to degrees
+    lat = plat[profile] + rng.normal(0, SPREAD_KM, n) / KM_PER_DEG_LAT
+    lon = plon[profile] + rng.normal(0, SPREAD_KM, n) / (KM_PER_DEG_LAT * np.cos(np.radians(plat[profile])))
+
+    # Category from the location type's mix (inverse CDF per row)
+    cdf = np.cumsum(mix, axis=1)[profile]
+    category = np.minimum((rng.random(n)[:, None] > cdf).sum(axis=1), len(KNOWN_CATEGORIES) - 1)
+    severity = rng.choice(len(SEVERITY_LEVELS), n, p=SEVERITY_MIX)
+
+    texts = [np.array(ISSUE_TEXTS[c], dtype=object) for c in KNOWN_CATEGORIES]
+    issue = np.empty(n, dtype=object)
+    for code, options in enumerate(texts):
+        rows = np.flatnonzero(category == code)
+        issue[rows] = options[rng.integers(0, len(options), rows.size)]
+
+    # Peak-hour-biased time of day
+    hour = rng.integers(0, 24, n)
+    in_peak = rng.random(n) < PEAK_HOUR_SHARE
+    for p, hours in enumerate(peak_hours):
+        rows = np.flatnonzero(in_peak & (profile == p))
+        hour[rows] = hours[rng.integers(0, len(hours), rows.size)]
+    seconds = rng.integers(0, days, n) * 86400 + hour * 3600 + rng.integers(0, 3600, n)
+
+    return pd.DataFrame({
+        "id": np.arange(first_id, first_id + n, dtype=np.int64),
+        "place": np.array(names, dtype=object)[profile],
+        "latitude": np.round(lat, 6),
+        "longitude": np.round(lon, 6),
+        "category": pd.Categorical.from_codes(category, KNOWN_CATEGORIES),
+        "severity": pd.Categorical.from_codes(severity, SEVERITY_LEVELS, ordered=True),
+        "issue": issue,
+        "timestamp": pd.to_datetime(start_ns + seconds * 1_000_000_000).astype(_TIMESTAMP_DTYPE),
+    }, columns=ISSUE_COLUMNS)
+
+
+def iter_synthetic_chunks(n, seed=0, start=DEFAULT_START, days=DEFAULT_DAYS,
+                          profiles=LOCATION_PROFILES, coords=LOCATION_COORDS):
+    """Yield DataFrames of up to BLOCK_SIZE synthetic issues, in the loader's schema and dtypes"""
+    tables = _profile_tables(profiles, coords)
+    start_ns = pd.Timestamp(start).as_unit("ns").value
+    # n == 0 still yields one (empty, correctly typed) block
+    for block, first in enumerate(range(0, max(n, 1), BLOCK_SIZE)):
+        rng = np.random.default_rng([seed, block])
+        yield _generate_block(min(BLOCK_SIZE, n - first), first + 1, rng, tables, start_ns, days)
+
+
+def generate_issues(n, seed=0, **kwargs):
+    """`n` synthetic issues as one DataFrame (same seed -> same records)"""
+    chunks = list(iter_synthetic_chunks(n, seed, **kwargs))
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+
+def _json_lines(df):
+    """Serialize one chunk as NDJSON lines (strings are JSON-encoded once per distinct value)"""
+    def quoted(col):
+        values = df[col].astype(str)
+        encoded = {v: json.dumps(v, ensure_ascii=False) for v in values.unique()}
+        return [encoded[v] for v in values.tolist()]
+
+    times = np.datetime_as_string(df["timestamp"].to_numpy().astype("datetime64[s]")).tolist()
+    return [
+        f'{{"id":{i},"place":{p},"latitude":{y!r},"longitude":{x!r},"category":{c},'
+        f'"severity":{s},"issue":{d},"timestamp":"{t}"}}'
+        for i, p, y, x, c, s, d, t in zip(
+            df["id"].tolist(), quoted("place"), df["latitude"].tolist(), df["longitude"].tolist(),
+            quoted("category"), quoted("severity"), quoted("issue"), times,
+        )
+    ]
+
+
+def write_issues(path, n, seed=0, fmt="jsonl", **kwargs):
+    """Stream `n` synthetic issues to `path` as NDJSON ("jsonl") or a db.json-style array ("json")"""
+    if fmt not in ("jsonl", "json"):
+        raise ValueError(f"Unknown format {fmt!r}; expected 'jsonl' or 'json'")
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "json":
+            f.write("[\n")
+        first = True
+        for chunk in iter_synthetic_chunks(n, seed, **kwargs):
+            lines = _json_lines(chunk)
+            if fmt == "json":
+                f.write(("" if first else ",\n") + ",\n".join(lines))
+            else:
+                f.write("\n".join(lines) + "\n")
+            first = False
+        if fmt == "json":
+            f.write("\n]\n")
+    return path
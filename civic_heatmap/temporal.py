@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+# --------------------------
+# Temporal index: sorted timestamps + binary search
+# --------------------------
+NS_PER_HOUR = 3_600_000_000_000
+NS_PER_DAY = 24 * NS_PER_HOUR
+_EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday (Monday = 0)
+
+
+def wall_clock_ns(timestamps):
+    """(int64 nanoseconds, timezone or None) of the timestamps as local wall-clock time.
+
+    tz-aware timestamps keep the hour and date they show in their own timezone (as popups
+    do) rather than being shifted to UTC; NaT becomes the int64 minimum.
+    """
+    ts = pd.to_datetime(pd.Series(timestamps))
+    tz = ts.dt.tz
+    if tz is not None:
+        ts = ts.dt.tz_localize(None)
+    return ts.to_numpy(dtype="datetime64[ns]").view(np.int64), tz
+
+
+class TemporalIndex:
+    """Sorted view of issue timestamps for O(log n + k) window queries.
+
+    All queries return row positions into the DataFrame the index was built from.
+    Hour-of-day x weekday histograms are computed once per labelling and cached.
+    Times are local wall-clock time, so hours and weekdays match what popups show.
+    """
+
+    def __init__(self, timestamps):
+        ts, self.tz = wall_clock_ns(timestamps)
+        valid = ts != np.iinfo(np.int64).min  # NaT
+        positions = np.flatnonzero(valid)
+        order = np.argsort(ts[valid], kind="stable")
+        self.order = positions[order]
+        self.sorted_ns = ts[valid][order]
+        self._ns = ts
+        self._valid = valid
+        self._hist_cache = {}
+
+    def __len__(self):
+        return self.sorted_ns.size
+
+    def to_ns(self, value):
+        """Window bound as wall-clock nanoseconds (aware bounds are converted to the index's timezone)"""
+        ts = pd.Timestamp(value)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert(self.tz or "UTC").tz_localize(None)
+        return ts.as_unit("ns").value
+
+    def _bounds(self, start, end):
+        lo = 0 if start is None else np.searchsorted(self.sorted_ns, self.to_ns(start), side="left")
+        hi = len(self) if end is None else np.searchsorted(self.sorted_ns, self.to_ns(end), side="left")
+        return int(lo), int(max(hi, lo))
+
+    def window(self, start=None, end=None):
+        """Rows with start <= timestamp < end, in time order"""
+        lo, hi = self._bounds(start, end)
+        return self.order[lo:hi]
+
+    def last_bounds(self, days=0, hours=0, now=None):
+        """(start, end) nanoseconds of the trailing window ending at `now` (default: newest issue)"""
+        end_ns = int(self.sorted_ns[-1]) + 1 if now is None else self.to_ns(now)
+        return end_ns - int(days * NS_PER_DAY + hours * NS_PER_HOUR), end_ns
+
+    def last(self, days=0, hours=0, now=None):
+        """Rows from the trailing window ending at `now` (default: newest issue)"""
+        if not len(self):
+            return self.order[:0]
+        return self.window(*self.last_bounds(days, hours, now))
+
+    def select(self, start=None, end=None, hours=None, weekdays=None):
+        """Rows inside [start, end), optionally restricted to a daily hour range and weekdays.
+
+        `hours=(8, 11)` means 08:00-11:00 every day and `hours=(22, 2)` 22:00-02:00 across
+        midnight (matched to the day it starts on); `weekdays` uses Monday = 0. One pair of
+        binary searches is done per matching day, so the cost is O(days * log n + k) rather
+        than a scan over every issue.
+        """
+        lo, hi = self._bounds(start, end)
+        if (hours is None and weekdays is None) or lo == hi:
+            return self.order[lo:hi]
+
+        h0, h1 = hours if hours is not None else (0, 24)
+        if h1 < h0:
+            # Wraps past midnight: the window ends on the next day, so also start a day early
+            h1 += 24
+        first_day = self.sorted_ns[lo] // NS_PER_DAY - (h1 > 24)
+        last_day = self.sorted_ns[hi - 1] // NS_PER_DAY
+        days = np.arange(first_day, last_day + 1)
+        if weekdays is not None:
+            days = days[np.isin((days + _EPOCH_WEEKDAY) % 7, list(weekdays))]
+
+        starts = np.searchsorted(self.sorted_ns[lo:hi], days * NS_PER_DAY + h0 * NS_PER_HOUR, side="left") + lo
+        ends = np.searchsorted(self.sorted_ns[lo:hi], days * NS_PER_DAY + h1 * NS_PER_HOUR, side="left") + lo
+        keep = ends > starts
+        if not keep.any():
+            return self.order[:0]
+        return np.concatenate([self.order[a:b] for a, b in zip(starts[keep], ends[keep])])
+
+    # --------------------------
+    # Hour-of-day x weekday histograms
+    # --------------------------
+    def histograms(self, labels, key=None):
+        """{label: 7x24 count array (weekday x hour)} for row labels such as nearest profile.
+
+        Rows labelled None are skipped. Results are cached under `key` when given.
+        """
+        if key is not None and key in self._hist_cache:
+            return self._hist_cache[key]
+
+        labels = pd.Series(np.asarray(labels, dtype=object))
+        usable = labels.notna().to_numpy() & self._valid
+        codes, names = pd.factorize(labels[usable])
+        ns = self._ns[usable]
+        hour = (ns // NS_PER_HOUR) % 24
+        weekday = (ns // NS_PER_DAY + _EPOCH_WEEKDAY) % 7
+        flat = codes.astype(np.int64) * 168 + weekday * 24 + hour
+        counts = np.bincount(flat, minlength=len(names) * 168).reshape(len(names), 7, 24)
+        result = {name: counts[i] for i, name in enumerate(names)}
+
+        if key is not None:
+            self._hist_cache[key] = result
+        return result
+
+
+def peak_hour_mask(peak_hours):
+    """24-slot boolean mask for profile peak ranges (inclusive, as in traffic generation)"""
+    mask = np.zeros(24, dtype=bool)
+    for peak_start, peak_end in peak_hours:
+        mask[peak_start:peak_end + 1] = True
+    return mask
+
+
+def peak_hour_share(histogram, peak_hours):
+    """Fraction of a 7x24 histogram that falls inside the profile's peak hours"""
+    total = histogram.sum()
+    if not total:
+        return 0.0
+    return float(histogram[:, peak_hour_mask(peak_hours)].sum() / total)
+
+
+def apply_time_window(df, index, window):
+    """Filter `df` with a window spec such as {"last_days": 7, "hours": (8, 11)} or
+    {"start": "2025-09-01", "end": "2025-09-08", "hours": (8, 11), "weekdays": range(5)}.
+
+    `last_days` (counted back from `now`, default the newest issue) narrows start/end, so
+    it combines with every other filter.
+    """
+    start, end = window.get("start"), window.get("end")
+    if window.get("last_days") is not None and len(index):
+        last_start, last_end = index.last_bounds(days=window["last_days"], now=window.get("now"))
+        start = last_start if start is None else max(last_start, index.to_ns(start))
+        end = last_end if end is None else min(last_end, index.to_ns(end))
+    rows = index.select(start, end, window.get("hours"), window.get("weekdays"))
+    # Keep the original record order for rendering
+    return df.iloc[np.sort(rows)].reset_index(drop=True)
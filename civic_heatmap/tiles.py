@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+from branca.element import Template, MacroElement
+
+from .aggregate import TILE_SIZE, DEFAULT_CELL_PX, project_to_pixels, aggregate_points
+from .payload import issues_to_geojson, dump_payload
+from .popups import popup_styles, ISSUE_POPUP_JS, ISSUE_MARKER_JS
+from .render import SEVERITY_HEAT_WEIGHTS
+
+# --------------------------
+# Static z/x/y tiled JSON export for issue layers
+# --------------------------
+# Below DETAIL_ZOOM a tile holds pre-aggregated cells instead of raw issues, so no single
+# low-zoom tile has to carry the full history. Raw issues are tiled at DETAIL_ZOOM only:
+# the page keeps drawing those tiles at every higher zoom, so each feature is written once.
+DETAIL_ZOOM = 14
+MANIFEST_NAME = "manifest.json"
+
+
+def tile_xy(lat, lon, zoom):
+    """Slippy-map tile indices of lat/lon arrays at `zoom`"""
+    x, y = project_to_pixels(lat, lon, zoom)
+    n = 2 ** zoom
+    tx = np.clip(np.floor(x / TILE_SIZE), 0, n - 1).astype(np.int64)
+    ty = np.clip(np.floor(y / TILE_SIZE), 0, n - 1).astype(np.int64)
+    return tx, ty
+
+
+def tile_keys(lat, lon, zoom):
+    """Set of "z/x/y" keys of the tiles holding lat/lon arrays at `zoom`"""
+    tx, ty = tile_xy(np.asarray(lat, dtype=float), np.asarray(lon, dtype=float), zoom)
+    return {f"{zoom}/{x}/{y}" for x, y in set(zip(tx.tolist(), ty.tolist()))}
+
+
+def _group_by_tile(tx, ty, zoom):
+    """Yield (x, y, row indices) for every non-empty tile"""
+    if not len(tx):
+        return
+    keys = tx * (2 ** zoom) + ty
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+    for start, end in zip(starts, ends):
+        idx = order[start:end]
+        yield int(tx[idx[0]]), int(ty[idx[0]]), idx
+
+
+def _within_bounds(df, bounds):
+    (south, west), (north, east) = bounds
+    return df[df["latitude"].between(south, north) & df["longitude"].between(west, east)]
+
+
+def read_manifest(out_dir):
+    """Manifest written by `export_tiles` (empty if the folder has not been tiled yet)"""
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"tiles": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_tiles(df, bounds, min_zoom=10, detail_zoom=DETAIL_ZOOM, cell_px=DEFAULT_CELL_PX, detail_keys=None):
+    """Yield ("z/x/y", tile JSON text) for every non-empty tile inside `bounds`.
+
+    With `detail_keys`, only those DETAIL_ZOOM tiles are built (aggregated tiles always are).
+    """
+    df = _within_bounds(df, bounds)
+    if df.empty:
+        return
+    lat = df["latitude"].to_numpy(dtype=float)
+    lon = df["longitude"].to_numpy(dtype=float)
+    weights = df["severity"].astype(str).map(SEVERITY_HEAT_WEIGHTS).fillna(1).to_numpy(dtype=float)
+
+    for zoom in range(min_zoom, detail_zoom):
+        cells = aggregate_points(lat, lon, weights, zoom, cell_px)
+        cells[:, :2] = np.round(cells[:, :2], 5)
+        tx, ty = tile_xy(cells[:, 0], cells[:, 1], zoom)
+        for x, y, idx in _group_by_tile(tx, ty, zoom):
+            yield f"{zoom}/{x}/{y}", dump_payload({"cells": cells[idx].tolist()})
+
+    tx, ty = tile_xy(lat, lon, detail_zoom)
+    if detail_keys is not None:
+        # Only features of the requested tiles are serialized
+        n = 2 ** detail_zoom
+        wanted = np.isin(tx * n + ty, [int(x) * n + int(y) for x, y in (k.split("/")[1:] for k in detail_keys)])
+        df, tx, ty = df[wanted], tx[wanted], ty[wanted]
+    features = [dump_payload(f) for f in issues_to_geojson(df)["features"]]
+    for x, y, idx in _group_by_tile(tx, ty, detail_zoom):
+        # Sorted, so a tile's bytes (and hash) do not depend on the feed's row order
+        text = '{"type":"FeatureCollection","features":[' + ",".join(sorted(features[i] for i in idx)) + "]}"
+        yield f"{detail_zoom}/{x}/{y}", text
+
+
+def export_tiles(df, out_dir, bounds, min_zoom=10, max_zoom=18, detail_zoom=DETAIL_ZOOM,
+                 cell_px=DEFAULT_CELL_PX, changes=None):
+    """Write tiles to out_dir/z/x/y.json, rewriting only tiles whose content hash changed.
+
+    A manifest of tile hashes is kept next to the tiles; tiles that no longer contain
+    any issues are removed. With `changes` (IncrementalBuild.changes) from the same build
+    cache the folder was last exported with, only detail tiles holding a new, changed or
+    removed issue are rebuilt. Returns counts of written / unchanged / removed tiles.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {
+        "bounds": json.loads(json.dumps(bounds)),
+        "min_zoom": min_zoom,
+        "max_zoom": max_zoom,
+        "detail_zoom": detail_zoom,
+        "cell_px": cell_px,
+        "source": changes["digest"] if changes else None,
+    }
+    stored = read_manifest(out_dir)
+    previous = stored.get("tiles", {})
+    incremental = (changes is not None and changes["since"] is not None and stored.get("source") == changes["since"]
+                   and all(stored.get(k) == v for k, v in manifest.items() if k != "source"))
+
+    current = {}
+    detail_keys = None
+    if incremental:
+        rows = changes["rows"]
+        detail_keys = (tile_keys(df["latitude"].to_numpy()[rows], df["longitude"].to_numpy()[rows], detail_zoom)
+                       | tile_keys(changes["old_lat"], changes["old_lon"], detail_zoom))
+        prefix = f"{detail_zoom}/"
+        current = {key: digest for key, digest in previous.items()
+                   if key.startswith(prefix) and key not in detail_keys}
+    written, unchanged = 0, len(current)
+
+    for key, text in build_tiles(df, bounds, min_zoom, detail_zoom, cell_px, detail_keys):
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        current[key] = digest
+        path = os.path.join(out_dir, key + ".json")
+        if previous.get(key) == digest and os.path.exists(path):
+            unchanged += 1
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        written += 1
+
+    removed = 0
+    for key in set(previous) - set(current):
+        path = os.path.join(out_dir, key + ".json")
+        if os.path.exists(path):
+            os.remove(path)
+            removed += 1
+
+    manifest["tiles"] = current
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"), sort_keys=True)
+
+    return {"written": written, "unchanged": unchanged, "removed": removed, "total": len(current)}
+
+
+# --------------------------
+# Client-side tile loader
+# --------------------------
+class TiledIssueLayer(MacroElement):
+    """Fetch only the tiles in view and draw them into existing FeatureGroups.
+
+    Detail tiles go into the category FeatureGroups; aggregated low-zoom tiles go into
+    `overview_layer`. Zooms past `detail_zoom` keep drawing the detail_zoom tiles; everything
+    loaded for a previous tile zoom is dropped when it changes.
+    Empty tiles simply 404 and are skipped. Tiles are fetched over HTTP, so serve the
+    output folder rather than opening the page via file://.
+    """
+
+    _template = Template("""
+{% macro script(this, kwargs) %}
+(function() {
+    var map = {{ this._parent.get_name() }};
+    var styles = {{ this.styles }};
+    var layers = { {%- for cat, layer in this.category_layers.items() %}
+        {{ cat|tojson }}: {{ layer.get_name() }},{% endfor %}
+    };
+    var overview = {{ this.overview_layer.get_name() }};
+    var root = {{ this.url_root|tojson }};
+    var minZoom = {{ this.min_zoom }}, maxZoom = {{ this.max_zoom }}, detailZoom = {{ this.detail_zoom }};
+    var loaded = {}, drawn = [], currentZoom = null;
+
+{{ this.popup_js }}
+{{ this.marker_js }}
+    function keep(marker, layer) {
+        layer.addLayer(marker);
+        drawn.push([marker, layer]);
+    }
+    function drawTile(z, data) {
+        if (z !== currentZoom) { return; }
+        if (data.cells) {
+            data.cells.forEach(function(c) {
+                keep(L.circleMarker([c[0], c[1]], {
+                    radius: Math.min(20, 3 + Math.sqrt(c[2])), color: 'white', weight: 1,
+                    fillColor: '#e74c3c', fillOpacity: 0.6
+                }).bindTooltip('Severity-weighted issues: ' + c[2]), overview);
+            });
+            return;
+        }
+        data.features.forEach(function(f) {
+            var p = f.properties, layer = layers[p.c];
+            if (!layer) { return; }
+            keep(issueCircle([f.geometry.coordinates[1], f.geometry.coordinates[0]], sevColor(p.s),
+                             function() { return popupHtml(p); }, issueTooltip(p)), layer);
+        });
+    }
+
+    function refresh() {
+        var z = Math.max(minZoom, Math.min(maxZoom, detailZoom, Math.round(map.getZoom())));
+        if (z !== currentZoom) {
+            drawn.forEach(function(d) { d[1].removeLayer(d[0]); });
+            drawn = [];
+            loaded = {};
+            currentZoom = z;
+        }
+        var bounds = map.getBounds(), size = 256;
+        var nw = map.project(bounds.getNorthWest(), z), se = map.project(bounds.getSouthEast(), z);
+        var x0 = Math.floor(nw.x / size), x1 = Math.floor(se.x / size);
+        var y0 = Math.floor(nw.y / size), y1 = Math.floor(se.y / size);
+        for (var x = x0; x <= x1; x++) {
+            for (var y = y0; y <= y1; y++) {
+                var key = z + '/' + x + '/' + y;
+                if (loaded[key]) { continue; }
+                loaded[key] = true;
+                (function(key, z) {
+                    fetch(root + '/' + key + '.json')
+                        .then(function(r) { return r.ok ? r.json() : null; })
+                        .then(function(data) { if (data) { drawTile(z, data); } })
+                        .catch(function() {});
+                })(key, z);
+            }
+        }
+    }
+    map.on('moveend', refresh);
+    refresh();
+})();
+{% endmacro %}
+""")
+
+    def __init__(self, url_root, category_layers, overview_layer, min_zoom=10, max_zoom=18,
+                 detail_zoom=DETAIL_ZOOM):
+        super().__init__()
+        self._name = "TiledIssueLayer"
+        self.url_root = url_root.rstrip("/")
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.detail_zoom = detail_zoom
+        self.styles = popup_styles()
+        self.popup_js = ISSUE_POPUP_JS
+        self.marker_js = ISSUE_MARKER_JS
+        self.category_layers = category_layers
+        self.overview_layer = overview_layer
@@ -0,0 +1,144 @@
+from datetime import datetime
+
+import numpy as np
+
+from .profiles import LOCATION_PROFILES, LOCATION_COORDS
+
+# Only numpy at import time so traffic-only runs start fast; the pandas-backed
+# spatial/temporal indexes are imported by location_issue_notes when it runs
+CONGESTION_LEVELS = ["Light", "Moderate", "Heavy"]
+CONGESTION_THRESHOLDS = [50, 75]  # same cut points as get_congestion_status
+
+# --------------------------
+# Dynamic Traffic Data Generation with Location-Specific Logic
+# --------------------------
+def generate_dynamic_traffic_data(profiles=LOCATION_PROFILES, coords=LOCATION_COORDS, seed=None):
+    """Generate location-specific traffic data based on profiles"""
+    # Imported here because congestion imports the status helpers below
+    from .congestion import CongestionModel
+
+    return CongestionModel(profiles, coords, seed=seed).traffic_data()
+
+def get_congestion_status(congestion):
+    """Get traffic status based on congestion percentage"""
+    if congestion >= 75:
+        return {"level": "Heavy", "color": "#d73027", "icon": "🔴"}
+    elif congestion >= 50:
+        return {"level": "Moderate", "color": "#fc8d59", "icon": "🟠"}
+    else:
+        return {"level": "Light", "color": "#4575b4", "icon": "🟢"}
+
+def congestion_level_counts(traffic_data):
+    """Heavy / Moderate / Light location counts in one pass over the congestion values"""
+    congestion = np.fromiter((t["congestion"] for t in traffic_data), dtype=float, count=len(traffic_data))
+    levels = np.searchsorted(CONGESTION_THRESHOLDS, congestion, side="right")
+    counts = np.bincount(levels, minlength=len(CONGESTION_LEVELS))
+    return {level: int(n) for level, n in zip(CONGESTION_LEVELS, counts)}
+
+# --------------------------
+# Traffic popups
+# --------------------------
+# Formatted once per location; static styling lives in the PopupStyles classes, only the
+# status color and congestion bar width are inline
+TRAFFIC_POPUP_TEMPLATE = (
+    '<div class="civic-popup civic-traffic">'
+    '<div class="civic-head" style="background: {color};">'
+    '<h3><span>🚦 {name}</span><span>{icon}</span></h3>'
+    '<p>📍 {kind} • {updated}</p></div>'
+    '<div class="civic-body">'
+    '<div class="civic-section"><h4>📈 Traffic Status</h4>'
+    '<div class="civic-card civic-status" style="border-left-color: {color};">'
+    '<strong>Congestion:</strong> {congestion}% - {level}<br>'
+    '<div class="civic-bar"><div style="background: {color}; width: {congestion}%;"></div></div>'
+    '<small class="civic-muted">🏷️ {specialty}</small>{notes}</div></div>'
+    '<div class="civic-section civic-hours"><h4>⏰ Best Work Hours</h4>'
+    '<div class="civic-card">{slots}</div></div>'
+    '<div class="civic-advice civic-advice-{advice_level}"><strong>💡 Recommendation:</strong><br>{advice}</div>'
+    '</div></div>'
+)
+TRAFFIC_SLOT_TEMPLATE = '<div class="civic-slot">✅ {}</div>'
+TRAFFIC_ADVICE = {
+    "high": "⚠️ High congestion - use early morning slots only!",
+    "moderate": "⚡ Moderate traffic - stick to optimal windows",
+    "low": "✅ Good conditions - flexible scheduling possible",
+}
+
+
+def traffic_popup_html(location, notes=""):
+    """Traffic popup for one location; `notes` is extra HTML appended to the status box"""
+    status = location["status"]
+    profile = location["profile"]
+    congestion = location["congestion"]
+    advice_level = "high" if congestion >= 70 else "moderate" if congestion >= 50 else "low"
+    return TRAFFIC_POPUP_TEMPLATE.format(
+        color=status["color"],
+        icon=status["icon"],
+        level=status["level"],
+        name=location["name"],
+        kind=profile["type"].replace("_", " ").title(),
+        updated=location["last_updated"],
+        congestion=congestion,
+        specialty=profile["specialty"],
+        notes=notes,
+        # Show only the first 2 optimal windows for performance
+        slots="".join(TRAFFIC_SLOT_TEMPLATE.format(hour) for hour in profile["optimal_work"][:2]),
+        advice_level=advice_level,
+        advice=TRAFFIC_ADVICE[advice_level],
+    )
+
+def traffic_tooltip(location):
+    return f"🚦 {location['name']}: {location['congestion']}% ({location['status']['level']})"
+
+def location_issue_notes(df, coords=LOCATION_COORDS, profiles=LOCATION_PROFILES,
+                         radius_km=1.0, match_km=3.0, time_index=None):
+    """Per-location popup notes from the issue data: nearby issue counts and peak-hour share"""
+    from .spatial import SpatialIndex, build_profile_index, assign_nearest_profile
+    from .temporal import TemporalIndex, peak_hour_share
+
+    if time_index is None:
+        time_index = TemporalIndex(df['timestamp'])
+
+    # Grid index over issue coordinates for "issues near this location" lookups
+    issue_index = SpatialIndex(df['latitude'], df['longitude'])
+    high_severity = (df['severity'] == 'high').to_numpy()
+
+    # Hour x weekday histogram of issues per nearest profile, compared against its peak hours
+    profile_index, profile_names = build_profile_index(coords)
+    issue_profiles, _ = assign_nearest_profile(df, profile_index, profile_names, max_km=match_km)
+    profile_histograms = time_index.histograms(issue_profiles, key='profile')
+
+    notes = {}
+    for name, coord in coords.items():
+        nearby = issue_index.query_radius(coord['lat'], coord['lng'], radius_km)
+        nearby_high = int(high_severity[nearby].sum())
+        histogram = profile_histograms.get(name)
+        profile_issues = int(histogram.sum()) if histogram is not None else 0
+        peak_share = peak_hour_share(histogram, profiles[name]['peak_hours']) if profile_issues else 0.0
+        notes[name] = (
+            f'<br><small class="civic-muted">📋 {len(nearby)} reported issues '
+            f'within {radius_km:g} km ({nearby_high} high)</small><br>'
+            f'<small class="civic-muted">⏱️ {peak_share:.0%} of {profile_issues} '
+            f'area issues reported during peak hours</small>'
+        )
+    return notes
+
+# --------------------------
+# Snapshot served to live pages
+# --------------------------
+def traffic_snapshot(traffic_data, notes=None):
+    """JSON-ready snapshot: congestion, status, tooltip and popup per location plus level counts"""
+    notes = notes or {}
+    return {
+        "updated": datetime.now().strftime("%H:%M:%S"),
+        "levels": congestion_level_counts(traffic_data),
+        "locations": [
+            {
+                "name": location["name"],
+                "congestion": location["congestion"],
+                "status": location["status"],
+                "tooltip": traffic_tooltip(location),
+                "popup": traffic_popup_html(location, notes.get(location["name"], "")),
+            }
+            for location in traffic_data
+        ],
+    }
@@ -0,0 +1,131 @@
+import numpy as np
+from branca.element import Template, MacroElement
+
+from .popups import popup_styles, ISSUE_POPUP_JS, ISSUE_MARKER_JS
+
+# --------------------------
+# Viewport-aware lazy issue layer
+# --------------------------
+# Issues are bucketed into a lat/lon grid at build time. The browser only turns the
+# buckets around the current view into Leaflet markers, and drops them again once they
+# are well outside it, so the number of live layers tracks the viewport, not the dataset.
+DEFAULT_CELL_DEG = 0.02  # ~2 km at Delhi's latitude
+DEFAULT_MIN_ZOOM = 12
+
+
+def bucket_issues(cols, cell_deg=DEFAULT_CELL_DEG, coord_precision=5):
+    """{"ix,iy": "[[lat,lon,popup_row],...]"} grid buckets from prepare_issue_columns output"""
+    lat = np.round(cols["lat"], coord_precision)
+    lon = np.round(cols["lon"], coord_precision)
+    iy = np.floor(lat / cell_deg).astype(np.int64)
+    ix = np.floor(lon / cell_deg).astype(np.int64)
+    order = np.lexsort((iy, ix))
+    boundaries = np.flatnonzero(np.diff(ix[order]) | np.diff(iy[order])) + 1
+
+    lat_s, lon_s, rows = lat.tolist(), lon.tolist(), cols["popup_row"]
+    buckets = {}
+    for group in np.split(order, boundaries) if order.size else []:
+        first = group[0]
+        buckets[f"{ix[first]},{iy[first]}"] = "[" + ",".join(
+            f"[{lat_s[k]!r},{lon_s[k]!r},{rows[k]}]" for k in group.tolist()
+        ) + "]"
+    return buckets
+
+
+class ViewportIssueLayer(MacroElement):
+    """Create issue markers only for grid cells in (or near) the viewport at zoom >= `min_zoom`.
+
+    Cells within `pad` view-sizes of the screen are loaded; cells beyond `evict_pad`
+    are removed from the category FeatureGroups and the MarkerCluster, so panning around
+    keeps a bounded number of markers alive. Below `min_zoom` no issue markers exist and
+    the density heatmap carries the overview. Popups use the shared lazy renderer.
+    """
+
+    _template = Template("""
+{% macro script(this, kwargs) %}
+(function() {
+    var map = {{ this._parent.get_name() }};
+    var styles = {{ this.styles }};
+    var layers = { {%- for cat, layer in this.category_layers.items() %}
+        {{ cat|tojson }}: {{ layer.get_name() }},{% endfor %}
+    };
+    var cluster = {{ this.marker_cluster.get_name() }};
+    var cells = { {%- for key, rows in this.buckets.items() %}
+        {{ key|tojson }}: {{ rows }},{% endfor %}
+    };
+    var cellDeg = {{ this.cell_deg }}, minZoom = {{ this.min_zoom }};
+    var pad = {{ this.pad }}, evictPad = {{ this.evict_pad }};
+    var live = {};
+
+{{ this.popup_js }}
+{{ this.marker_js }}
+    function build(rows) {
+        var circles = [], markers = [];
+        rows.forEach(function(r) {
+            var p = {i: r[2][0], p: r[2][1], c: r[2][2], s: r[2][3], d: r[2][4], t: r[2][5]};
+            var ll = [r[0], r[1]];
+            var tip = issueTooltip(p);
+            var popup = function() { return popupHtml(p); };
+            var layer = layers[p.c];
+            if (layer) {
+                var circle = issueCircle(ll, sevColor(p.s), popup, tip);
+                layer.addLayer(circle);
+                circles.push([circle, layer]);
+            }
+            markers.push(issueMarker(ll, iconColor(p.s), catIcon(p.c), popup, tip));
+        });
+        cluster.addLayers(markers);
+        return {circles: circles, markers: markers};
+    }
+    function evict(key) {
+        var cell = live[key];
+        cell.circles.forEach(function(c) { c[1].removeLayer(c[0]); });
+        cluster.removeLayers(cell.markers);
+        delete live[key];
+    }
+    function cellRange(bounds) {
+        return {
+            x0: Math.floor(bounds.getWest() / cellDeg), x1: Math.floor(bounds.getEast() / cellDeg),
+            y0: Math.floor(bounds.getSouth() / cellDeg), y1: Math.floor(bounds.getNorth() / cellDeg)
+        };
+    }
+    function refresh() {
+        if (map.getZoom() < minZoom) {
+            Object.keys(live).forEach(evict);
+            return;
+        }
+        var view = map.getBounds();
+        var keepRange = cellRange(view.pad(evictPad));
+        Object.keys(live).forEach(function(key) {
+            var xy = key.split(',');
+            var x = +xy[0], y = +xy[1];
+            if (x < keepRange.x0 || x > keepRange.x1 || y < keepRange.y0 || y > keepRange.y1) { evict(key); }
+        });
+        var loadRange = cellRange(view.pad(pad));
+        for (var x = loadRange.x0; x <= loadRange.x1; x++) {
+            for (var y = loadRange.y0; y <= loadRange.y1; y++) {
+                var key = x + ',' + y;
+                if (!live[key] && cells[key]) { live[key] = build(cells[key]); }
+            }
+        }
+    }
+    map.on('moveend', refresh);
+    map.whenReady(refresh);
+})();
+{% endmacro %}
+""")
+
+    def __init__(self, cols, category_layers, marker_cluster, min_zoom=DEFAULT_MIN_ZOOM,
+                 cell_deg=DEFAULT_CELL_DEG, pad=0.5, evict_pad=1.5):
+        super().__init__()
+        self._name = "ViewportIssueLayer"
+        self.buckets = {key: rows.replace("</", "<\\/") for key, rows in bucket_issues(cols, cell_deg).items()}
+        self.styles = popup_styles()
+        self.popup_js = ISSUE_POPUP_JS
+        self.marker_js = ISSUE_MARKER_JS
+        self.category_layers = category_layers
+        self.marker_cluster = marker_cluster
+        self.min_zoom = min_zoom
+        self.cell_deg = cell_deg
+        self.pad = pad
+        self.evict_pad = evict_pad
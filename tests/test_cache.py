@@ -0,0 +1,86 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from civic_heatmap.cache import cache_dir_for, load_issues_cached
+from civic_heatmap.synthetic import write_issues
+
+
+def assert_same_frame(a, b):
+    assert list(a.columns) == list(b.columns)
+    assert list(a.dtypes) == list(b.dtypes)
+    assert a.equals(b)
+
+
+def write_records(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f)
+    return str(path)
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl"])
+def test_warm_load_matches_cold_load(tmp_path, fmt):
+    feed = write_issues(str(tmp_path / f"issues.{fmt}"), 300, seed=1, fmt=fmt)
+    cold, kind = load_issues_cached(feed)
+    assert kind == "cold"
+    warm, kind = load_issues_cached(feed)
+    assert kind == "warm"
+    assert_same_frame(cold, warm)
+
+
+def test_text_ids_and_aware_timestamps_round_trip(tmp_path):
+    feed = write_records(tmp_path / "db.json", [
+        {"id": "a-1", "place": "Karol Bagh", "latitude": 28.65, "longitude": 77.19, "category": "water",
+         "severity": "high", "issue": "Pipe burst", "timestamp": "2025-09-01T08:30:00+05:30"},
+        {"id": "b-2", "place": "Saket", "latitude": 28.52, "longitude": 77.21, "category": None,
+         "severity": "low", "issue": "Unlabelled", "timestamp": "2025-09-02T23:15:00+05:30"},
+    ])
+    cold, _ = load_issues_cached(feed)
+    warm, kind = load_issues_cached(feed)
+    assert kind == "warm"
+    assert_same_frame(cold, warm)
+    assert str(warm["timestamp"].dt.tz) == str(cold["timestamp"].dt.tz)
+
+
+def test_warm_frame_is_writable_without_touching_the_cache(tmp_path):
+    feed = write_issues(str(tmp_path / "issues.jsonl"), 50, seed=2)
+    cold, _ = load_issues_cached(feed)
+    warm, _ = load_issues_cached(feed)
+    warm.loc[0, "latitude"] = 1.0
+    warm.loc[1, "severity"] = "high"
+    assert warm.loc[0, "latitude"] == 1.0
+
+    again, kind = load_issues_cached(feed)
+    assert kind == "warm"
+    assert_same_frame(cold, again)
+
+
+def test_changed_feed_is_parsed_again(tmp_path):
+    feed = write_issues(str(tmp_path / "issues.jsonl"), 40, seed=4)
+    load_issues_cached(feed)
+    write_issues(feed, 60, seed=5)
+    df, kind = load_issues_cached(feed)
+    assert kind == "cold"
+    assert len(df) == 60
+
+
+def test_incomplete_schema_is_not_cached(tmp_path):
+    feed = write_records(tmp_path / "db.json", [
+        {"id": 1, "latitude": 28.6, "longitude": 77.2, "category": "waste", "severity": "low",
+         "issue": "Overflowing bin", "timestamp": "2025-09-01T10:00:00"},
+    ])
+    for _ in range(2):
+        df, kind = load_issues_cached(feed)
+        assert kind == "cold"
+        assert len(df) == 1
+    assert not os.path.exists(cache_dir_for(feed))
+
+
+def test_refresh_neither_reads_nor_writes_the_cache(tmp_path):
+    feed = write_issues(str(tmp_path / "issues.jsonl"), 20, seed=6)
+    df, kind = load_issues_cached(feed, refresh=True)
+    assert kind == "cold"
+    assert not os.path.exists(cache_dir_for(feed))
+    pd.testing.assert_frame_equal(df, load_issues_cached(feed)[0])
@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from civic_heatmap.build import DELHI_BOUNDS
+from civic_heatmap.incremental import IncrementalBuild
+from civic_heatmap.synthetic import generate_issues
+from civic_heatmap.tiles import export_tiles
+
+
+def edits(df):
+    """(label, frame) after each of: modify, remove, add, reorder"""
+    df = df.copy()
+    df.loc[[3, 5], "issue"] = "Reported again with more detail"
+    df.loc[7, "latitude"] += 0.02
+    df.loc[9, "severity"] = "high"
+    yield "modify", df
+
+    df = df.drop(index=[10, 11, 12]).reset_index(drop=True)
+    yield "remove", df
+
+    extra = generate_issues(5, seed=99)
+    extra["id"] += 10_000
+    df = pd.concat([df, extra], ignore_index=True)
+    yield "add", df
+
+    yield "reorder", df.sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def assert_same_build(build, cols, expected_build, expected_cols):
+    assert cols.keys() == expected_cols.keys()
+    for key in expected_cols:
+        np.testing.assert_array_equal(cols[key], expected_cols[key], err_msg=key)
+    assert build.digest == expected_build.digest
+    pd.testing.assert_frame_equal(build.stats.category_severity(), expected_build.stats.category_severity())
+    assert build.stats.total == expected_build.stats.total
+
+
+@pytest.mark.parametrize("marker_js", [False, True])
+def test_incremental_build_matches_fresh_build(tmp_path, marker_js):
+    cache = str(tmp_path / "build.pkl")
+    df = generate_issues(300, seed=2)
+    build = IncrementalBuild(cache)
+    build.update(df, marker_js=marker_js)
+    build.save()
+
+    for label, df in edits(df):
+        build = IncrementalBuild(cache)
+        cols = build.update(df, marker_js=marker_js)
+        build.save()
+        fresh = IncrementalBuild(None)
+        assert_same_build(build, cols, fresh, fresh.update(df, marker_js=marker_js))
+        assert build.last_update["reused"] >= len(df) - 5, label
+
+
+def test_update_counts(tmp_path):
+    cache = str(tmp_path / "build.pkl")
+    steps = iter(edits(generate_issues(100, seed=3)))
+    build = IncrementalBuild(cache)
+    build.update(generate_issues(100, seed=3))
+    build.save()
+
+    expected = {"modify": (0, 4, 0), "remove": (0, 0, 3), "add": (5, 0, 0), "reorder": (0, 0, 0)}
+    for label, df in steps:
+        build = IncrementalBuild(cache)
+        build.update(df)
+        build.save()
+        update = build.last_update
+        assert (update["new"], update["changed"], update["removed"]) == expected[label], label
+
+
+def test_marker_lines_cached_by_another_mode(tmp_path):
+    cache = str(tmp_path / "build.pkl")
+    df = generate_issues(80, seed=4)
+    build = IncrementalBuild(cache)
+    build.update(df, marker_js=False)
+    build.save()
+
+    cols = IncrementalBuild(cache).update(df, marker_js=True)
+    np.testing.assert_array_equal(cols["marker_js"], IncrementalBuild(None).update(df, marker_js=True)["marker_js"])
+
+
+def read_tiles(out_dir):
+    tiles = {}
+    for root, _, files in os.walk(out_dir):
+        for name in files:
+            if name != "manifest.json":
+                path = os.path.join(root, name)
+                with open(path, encoding="utf-8") as f:
+                    tiles[os.path.relpath(path, out_dir)] = f.read()
+    return tiles
+
+
+def test_incremental_tiles_match_fresh_tiles(tmp_path):
+    cache = str(tmp_path / "build.pkl")
+    tiles = str(tmp_path / "tiles")
+    df = generate_issues(400, seed=5)
+    build = IncrementalBuild(cache)
+    build.update(df)
+    export_tiles(df, tiles, DELHI_BOUNDS, changes=build.changes)
+    build.save()
+
+    for label, df in edits(df):
+        build = IncrementalBuild(cache)
+        build.update(df)
+        summary = export_tiles(df, tiles, DELHI_BOUNDS, changes=build.changes)
+        build.save()
+        fresh = str(tmp_path / f"fresh_{label}")
+        export_tiles(df, fresh, DELHI_BOUNDS)
+        assert read_tiles(tiles) == read_tiles(fresh), label
+        if label == "reorder":
+            # Nothing changed, so no detail tile is rebuilt
+            assert len(build.changes["rows"]) == summary["removed"] == 0
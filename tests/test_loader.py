@@ -0,0 +1,40 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from civic_heatmap import loader
+from civic_heatmap.synthetic import write_issues
+
+# Feeds whose scalars, strings and records get cut at every possible block boundary
+ARRAYS = [
+    "[12345, 678]",
+    '[1.5e10, -3, true, false, null, "a, b]", {"a": [1, 2]}, 99]',
+    "  [ ]",
+    '[\n {"id": 1, "place": "Connaught Place"},\n {"id": 22}\n]',
+]
+
+
+@pytest.mark.parametrize("block", range(1, 9))
+@pytest.mark.parametrize("text", ARRAYS)
+def test_json_array_across_block_boundaries(monkeypatch, text, block):
+    monkeypatch.setattr(loader, "_READ_BLOCK", block)
+    assert list(loader._iter_json_array(io.StringIO(text))) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["[1x]", "[1, 2", '{"id": 1}'])
+def test_json_array_rejects_malformed_feeds(monkeypatch, text):
+    monkeypatch.setattr(loader, "_READ_BLOCK", 3)
+    with pytest.raises(ValueError):
+        list(loader._iter_json_array(io.StringIO(text)))
+
+
+def test_array_and_lines_feeds_load_the_same(tmp_path, monkeypatch):
+    monkeypatch.setattr(loader, "_READ_BLOCK", 97)
+    array = write_issues(str(tmp_path / "issues.json"), 500, seed=3, fmt="json")
+    lines = write_issues(str(tmp_path / "issues.jsonl"), 500, seed=3, fmt="jsonl")
+
+    df = loader.load_issues(array, chunksize=64)
+    assert len(df) == 500
+    pd.testing.assert_frame_equal(df, loader.load_issues(lines, chunksize=100))
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from civic_heatmap.spatial import SpatialIndex
+
+
+def points(n, seed=0, clustered=True):
+    rng = np.random.default_rng(seed)
+    lat = 28.4 + rng.random(n) * 0.5
+    lon = 76.9 + rng.random(n) * 0.5
+    if clustered:
+        # A dense cluster plus sparse outskirts exercises both short and long ring searches
+        lat[: n // 4] = 28.6 + rng.normal(0, 0.004, n // 4)
+        lon[: n // 4] = 77.2 + rng.normal(0, 0.004, n // 4)
+    return lat, lon
+
+
+def brute_distances(index, lat, lon):
+    qx, qy = index.project(np.atleast_1d(lat), np.atleast_1d(lon))
+    return np.hypot(qx[:, None] - index.x[None, :], qy[:, None] - index.y[None, :])
+
+
+@pytest.mark.parametrize("n", [1, 7, 2000])
+@pytest.mark.parametrize("cell_km", [0.25, 2.0])
+def test_nearest_matches_brute_force(n, cell_km):
+    index = SpatialIndex(*points(n, seed=n), cell_km=cell_km)
+    # Queries inside the grid and well outside it
+    qlat, qlon = points(500, seed=n + 1, clustered=False)
+    qlat = np.r_[qlat, 27.0, 30.5, 28.6]
+    qlon = np.r_[qlon, 75.0, 78.9, 80.0]
+
+    idx, dist = index.nearest(qlat, qlon)
+    d = brute_distances(index, qlat, qlon)
+    np.testing.assert_allclose(dist, d.min(axis=1))
+    np.testing.assert_allclose(d[np.arange(len(idx)), idx], dist)
+
+
+def test_nearest_on_empty_index():
+    with pytest.raises(ValueError):
+        SpatialIndex([], []).nearest([28.6], [77.2])
+
+
+@pytest.mark.parametrize("radius_km", [0.1, 1.0, 5.0, 100.0])
+def test_query_radius_matches_brute_force(radius_km):
+    index = SpatialIndex(*points(3000, seed=3))
+    for lat, lon in [(28.6, 77.2), (28.45, 76.95), (28.9, 77.4), (29.5, 78.0)]:
+        idx, dist = index.query_radius(lat, lon, radius_km, return_distance=True)
+        d = brute_distances(index, lat, lon)[0]
+        np.testing.assert_array_equal(np.sort(idx), np.flatnonzero(d <= radius_km))
+        np.testing.assert_allclose(dist, d[idx])
+        assert np.all(np.diff(dist) >= 0)
+
+
+def test_query_bbox_matches_brute_force():
+    lat, lon = points(3000, seed=4)
+    index = SpatialIndex(lat, lon)
+    south, west, north, east = 28.55, 77.1, 28.7, 77.3
+    expected = np.flatnonzero((lat >= south) & (lat <= north) & (lon >= west) & (lon <= east))
+    np.testing.assert_array_equal(index.query_bbox(south, west, north, east), expected)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from civic_heatmap.temporal import TemporalIndex
+
+
+def timestamps(n=2000, tz=None, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2025-09-01").as_unit("ns").value
+    offsets = rng.integers(0, 21 * 24 * 3600, size=n) * 1_000_000_000
+    ts = pd.Series(pd.to_datetime(start + offsets))
+    return ts.dt.tz_localize(tz) if tz else ts
+
+
+def expected_rows(ts, start=None, end=None, hours=None, weekdays=None):
+    """Brute-force reference for TemporalIndex.select on local wall-clock time"""
+    keep = np.ones(len(ts), dtype=bool)
+    if start is not None:
+        keep &= (ts >= start).to_numpy()
+    if end is not None:
+        keep &= (ts < end).to_numpy()
+    hour = ts.dt.hour.to_numpy()
+    # A window wrapping past midnight belongs to the day it starts on
+    day = ts.dt.weekday.to_numpy()
+    if hours is not None:
+        h0, h1 = hours
+        if h0 <= h1:
+            keep &= (hour >= h0) & (hour < h1)
+        else:
+            early = hour < h1
+            keep &= (hour >= h0) | early
+            day = np.where(early, (day - 1) % 7, day)
+    if weekdays is not None:
+        keep &= np.isin(day, list(weekdays))
+    return np.flatnonzero(keep)
+
+
+WINDOWS = [
+    {},
+    {"start": "2025-09-05", "end": "2025-09-12"},
+    {"hours": (8, 11)},
+    {"hours": (22, 2)},
+    {"hours": (23, 1), "weekdays": [4]},
+    {"weekdays": range(5)},
+    {"start": "2025-09-03 12:00", "end": "2025-09-17", "hours": (20, 4), "weekdays": [5, 6]},
+    {"hours": (0, 24)},
+]
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+@pytest.mark.parametrize("tz", [None, "Asia/Kolkata"])
+def test_select_matches_brute_force(window, tz):
+    ts = timestamps(tz=tz)
+    bounds = {key: pd.Timestamp(window[key]).tz_localize(tz) if tz else window[key]
+              for key in ("start", "end") if key in window}
+    got = TemporalIndex(ts).select(**{**window, **bounds})
+    expected = expected_rows(ts, bounds.get("start"), bounds.get("end"), window.get("hours"), window.get("weekdays"))
+    np.testing.assert_array_equal(np.sort(got), expected)
+
+
+def test_aware_timestamps_use_local_wall_clock():
+    ts = pd.Series(pd.to_datetime(["2025-09-01T08:30:00+05:30", "2025-09-01T23:30:00+05:30",
+                                   "2025-09-02T01:00:00+05:30", "2025-09-02T14:00:00+05:30"]))
+    index = TemporalIndex(ts)
+    assert sorted(index.select(hours=(8, 11))) == [0]
+    # 22:00-02:00 across midnight; 03:00 UTC (08:30 local) must not match (3, 4)
+    assert sorted(index.select(hours=(22, 2))) == [1, 2]
+    assert len(index.select(hours=(3, 4))) == 0
+    # Monday 23:30 and the 01:00 that continues Monday night
+    assert sorted(index.select(hours=(22, 2), weekdays=[0])) == [1, 2]
+    assert len(index.select(hours=(22, 2), weekdays=[1])) == 0
+
+
+def test_aware_bounds_on_aware_index():
+    ts = timestamps(500, tz="Asia/Kolkata", seed=1)
+    start = pd.Timestamp("2025-09-04T18:30:00Z")  # 2025-09-05 00:00 in Delhi
+    got = TemporalIndex(ts).select(start=start, hours=(9, 17))
+    np.testing.assert_array_equal(np.sort(got), expected_rows(ts, start=start, hours=(9, 17)))
+
+
+def test_last_days():
+    ts = timestamps(1000, seed=2)
+    index = TemporalIndex(ts)
+    newest = ts.max()
+    np.testing.assert_array_equal(np.sort(index.last(days=3)), np.flatnonzero((ts > newest - pd.Timedelta(days=3)).to_numpy()))
+    assert len(TemporalIndex(ts[:0]).last(days=3)) == 0